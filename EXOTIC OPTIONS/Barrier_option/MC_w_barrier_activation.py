@@ -16,14 +16,71 @@ def simulate_asset_paths(S0, mu, sigma, T, dt, num_paths):
     
     return paths
 
-def check_barrier_condition(paths, barrier_level, barrier_type='knock_in'):
-    if barrier_type == 'knock_in':
-        # Check if path ever goes below barrier
-        triggered = np.any(paths <= barrier_level, axis=1)
-    else:  # knock_out
-        # Check if path ever goes below barrier
-        triggered = np.any(paths <= barrier_level, axis=1)
-    return triggered
+# Broadie-Glasserman-Kou constant: -zeta(1/2) / sqrt(2 pi)
+BGK_BETA = 0.5826
+
+def barrier_hit_probability(paths, barrier_level, sigma, dt, direction='down'):
+    """Probability that each path touches the barrier under continuous monitoring.
+
+    Between two grid points log S is a Brownian bridge, so a step that starts and
+    ends on the safe side at log-distances a, b > 0 from the barrier crosses it
+    with probability exp(-2 a b / (sigma^2 dt)). The path survives if no step crosses.
+    """
+    log_dist = np.log(paths / barrier_level)
+    if direction == 'up':
+        log_dist = -log_dist
+    a, b = log_dist[:, :-1], log_dist[:, 1:]
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        p = np.where((a > 0) & (b > 0), np.exp(-2 * a * b / (sigma**2 * dt)), 1.0)
+        survival = np.exp(np.sum(np.log1p(-p), axis=1))
+    return 1 - survival
+
+def check_barrier_condition(paths, barrier_level, direction='down', method='discrete', sigma=None, dt=None,
+                            rng=None):
+    """Paths that touched the barrier: knocked in for a knock-in option, knocked out for a knock-out.
+
+    method='discrete' only looks at the grid points. For continuous monitoring on a
+    coarse grid, 'bridge' samples a crossing between grid points with the Brownian-bridge
+    probability and 'bgk' checks the grid against the barrier shifted towards the spot by
+    exp(BGK_BETA * sigma * sqrt(dt)) (Broadie-Glasserman-Kou). Both need sigma and dt.
+    """
+    if method == 'bridge':
+        rng = np.random.default_rng() if rng is None else rng
+        hit_probability = barrier_hit_probability(paths, barrier_level, sigma, dt, direction)
+        return rng.random(len(paths)) < hit_probability
+    if method == 'bgk':
+        shift = np.exp(BGK_BETA * sigma * np.sqrt(dt))
+        barrier_level = barrier_level * shift if direction == 'down' else barrier_level / shift
+    elif method != 'discrete':
+        raise ValueError("method must be 'discrete', 'bridge' or 'bgk'")
+    if direction == 'down':
+        return np.any(paths <= barrier_level, axis=1)
+    return np.any(paths >= barrier_level, axis=1)
+
+def price_barrier_mc(S0, K, barrier_level, r, sigma, T, n_steps, n_paths, option='call', direction='down',
+                     barrier_type='knock_out', method='bridge', seed=None):
+    """Monte Carlo price and standard error of a continuously monitored barrier option.
+
+    With method='bridge' each payoff is weighted by its path's survival (knock-out) or
+    hit (knock-in) probability instead of a sampled crossing, which is unbiased for
+    GBM on any grid, so 12-50 steps do the work of a fine grid.
+    """
+    rng = np.random.default_rng(seed)
+    dt = T / n_steps
+    increments = (r - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * rng.standard_normal((n_paths, n_steps))
+    paths = np.empty((n_paths, n_steps + 1))
+    paths[:, 0] = S0
+    paths[:, 1:] = S0 * np.exp(np.cumsum(increments, axis=1))
+
+    sign = 1.0 if option == 'call' else -1.0
+    payoff = np.maximum(sign * (paths[:, -1] - K), 0.0)
+    if method == 'bridge':
+        hit = barrier_hit_probability(paths, barrier_level, sigma, dt, direction)
+    else:
+        hit = check_barrier_condition(paths, barrier_level, direction, method, sigma, dt)
+    weight = 1 - hit if barrier_type == 'knock_out' else hit
+    discounted = np.exp(-r * T) * payoff * weight
+    return discounted.mean(), discounted.std(ddof=1) / np.sqrt(n_paths)
 
 def plot_paths_with_barrier(paths, time_points, barrier_level, triggered, barrier_type):
     plt.figure(figsize=(12, 8))
@@ -73,13 +130,20 @@ def main():
     num_steps = int(T / dt)
     time_points = np.linspace(0, T, num_steps + 1)
     
-    triggered = check_barrier_condition(paths, barrier_level, barrier_type)
+    triggered = check_barrier_condition(paths, barrier_level)
     
     plt = plot_paths_with_barrier(paths, time_points, barrier_level, triggered, barrier_type)
     
     print(f"Total paths: {num_paths}")
     print(f"Paths that {'knocked in' if barrier_type == 'knock_in' else 'knocked out'}: {np.sum(triggered)}")
     print(f"Percentage: {np.sum(triggered) / num_paths * 100:.2f}%")
+
+    # Down-and-out call (K=100, B=90): grid-only monitoring vs bridge / BGK corrections
+    print(f"\n{'Steps':>6}{'Discrete':>12}{'BGK':>12}{'Bridge':>12}")
+    for n_steps in (12, 25, 50, 252, 1000):
+        prices = [price_barrier_mc(S0, 100, 90, mu, sigma, T, n_steps, 100_000,
+                                   method=method, seed=0)[0] for method in ('discrete', 'bgk', 'bridge')]
+        print(f"{n_steps:>6}" + "".join(f"{p:>12.4f}" for p in prices))
     
     plt.show()
 
@@ -4,6 +4,8 @@ import matplotlib.dates as mdates
 from datetime import datetime, timedelta
 import pandas as pd
 
+from Cliquet_engine import period_returns
+
 np.random.seed(42)
 
 initial_price = 100
@@ -25,16 +27,8 @@ def simulate_asset_path(initial_price, drift, volatility, periods, steps_per_per
     return full_price_path
 
 def calculate_cliquet_returns(price_path, periods, steps_per_period, cap, floor):
-    reset_indices = [i * steps_per_period for i in range(periods + 1)]
-    reset_prices = price_path[reset_indices]
-    raw_returns = []
-    capped_floored_returns = []
-    
-    for i in range(1, len(reset_prices)):
-        period_return = (reset_prices[i] / reset_prices[i-1]) - 1
-        raw_returns.append(period_return)
-        capped_floored_return = min(max(period_return, floor), cap)
-        capped_floored_returns.append(capped_floored_return)
+    raw_returns = period_returns(price_path[:periods * steps_per_period + 1], steps_per_period)
+    capped_floored_returns = np.clip(raw_returns, floor, cap)
     return raw_returns, capped_floored_returns
 
 start_date = datetime(2025, 1, 1)
@@ -60,7 +54,7 @@ print(df)
 plt.figure(figsize=(14, 10))
 
 plt.subplot(3, 1, 1)
-reset_indices = [i * days_per_period for i in range(periods + 1)]
+reset_indices = np.arange(periods + 1) * days_per_period
 plt.plot(price_path, color='gray', alpha=0.7, linewidth=1)
 plt.plot(reset_indices, price_path[reset_indices], 'ro', markersize=8)
 plt.grid(True, alpha=0.3)
@@ -4,6 +4,9 @@ from scipy import stats
 import seaborn as sns
 from matplotlib.lines import Line2D
 
+from Cliquet_engine import cliquet_payoff, period_returns
+from Cliquet_pricer import cliquet_price
+
 np.random.seed(42)
 
 n_simulations = 1000
@@ -37,16 +40,9 @@ def calculate_vanilla_payoff(paths):
     return np.maximum(final_prices - K, 0)
 
 def calculate_cliquet_payoff(paths):
-    periodic_returns = np.zeros((n_simulations, n_periods))
-    
-    for t in range(1, n_periods + 1):
-        returns = paths[:, t] / paths[:, t-1] - 1  # Calculate returns
-        periodic_returns[:, t-1] = np.clip(returns, local_floor, local_cap)  # Apply local cap and floor
-    
-    total_returns = np.sum(periodic_returns, axis=1)
-    total_returns = np.clip(total_returns, global_floor, global_cap)
-    
-    return S0 * total_returns
+    # Local cap/floor on every period return, then the global cap/floor on their sum
+    returns = period_returns(paths)
+    return S0 * cliquet_payoff(returns, local_cap, local_floor, global_cap, global_floor)
 
 def plot_results(vanilla_payoffs, cliquet_payoffs):
     plt.figure(figsize=(14, 8))
@@ -132,6 +128,11 @@ def main():
     print(f"  Max: ${np.max(cliquet_payoffs):.2f}")
     print(f"  Std Dev: ${np.std(cliquet_payoffs):.2f}")
     
+    # Closed-form / FFT value of the same contract, discounted (the MC statistics above are undiscounted)
+    value = cliquet_price(S0, r, sigma, T, n_periods, local_cap, local_floor, global_cap, global_floor)
+    print(f"\nSemi-analytic cliquet value: ${float(value):.4f} "
+          f"(MC: ${np.exp(-r * T) * np.mean(cliquet_payoffs):.4f} from {n_simulations} paths)")
+    
     plot_results(vanilla_payoffs, cliquet_payoffs)
 
 if __name__ == "__main__":
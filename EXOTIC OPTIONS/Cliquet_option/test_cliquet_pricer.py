@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from Cliquet_pricer import cliquet_price, cliquet_price_mc, forward_start_call
+
+S0, r, sigma, T, n_periods = 100, 0.05, 0.20, 1.0, 12
+
+
+def test_call_vanishes_at_infinite_strike():
+    assert forward_start_call(np.inf, r, sigma, T / n_periods) == 0.0
+
+
+def test_uncapped_local_leg_is_finite():
+    uncapped = cliquet_price(S0, r, sigma, T, n_periods, np.inf, -0.01)
+    # A cap far above any monthly return prices the same contract
+    assert np.isfinite(uncapped)
+    assert uncapped == pytest.approx(cliquet_price(S0, r, sigma, T, n_periods, 10.0, -0.01), abs=1e-10)
+
+
+def test_floor_below_minus_one_is_no_floor():
+    unfloored = cliquet_price(S0, r, sigma, T, n_periods, 0.05, -np.inf)
+    assert np.isfinite(unfloored)
+    assert unfloored == cliquet_price(S0, r, sigma, T, n_periods, 0.05, -1.0)
+    assert unfloored == cliquet_price(S0, r, sigma, T, n_periods, 0.05, -5.0)
+
+
+def test_unbounded_local_legs_sum_the_forward_returns():
+    price = cliquet_price(S0, r, sigma, T, n_periods, np.inf, -np.inf)
+    assert price == pytest.approx(S0 * np.exp(-r * T) * n_periods * np.expm1(r * T / n_periods), rel=1e-12)
+
+
+@pytest.mark.parametrize("seed, local_cap, local_floor, global_cap, global_floor", [
+    (1, np.inf, -0.01, 0.30, 0.0),
+    (2, 0.05, -np.inf, 0.20, -0.10),
+    (3, np.inf, -np.inf, 0.30, -0.20),
+])
+def test_infinite_local_bounds_with_global_bounds_match_monte_carlo(seed, local_cap, local_floor, global_cap,
+                                                                    global_floor):
+    price = cliquet_price(S0, r, sigma, T, n_periods, local_cap, local_floor, global_cap, global_floor)
+    mc, se = cliquet_price_mc(S0, r, sigma, T, n_periods, local_cap, local_floor, global_cap, global_floor,
+                              n_paths=400_000, seed=seed)
+    assert np.isfinite(price)
+    assert abs(price - mc) < 4 * se
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
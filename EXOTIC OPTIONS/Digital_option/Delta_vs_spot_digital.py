@@ -3,19 +3,9 @@ import matplotlib.pyplot as plt
 from scipy.stats import norm
 import matplotlib.ticker as mticker
 
-np.random.seed(42)
-
-def digital_option_price(S, K, T, r, sigma):
-    if T <= 0:
-        return 1.0 if S > K else 0.0
-    d2 = (np.log(S/K) + (r - 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-    return np.exp(-r * T) * norm.cdf(d2)
+from Digital_pricer import binary_option, call_spread_digital
 
-def digital_option_delta(S, K, T, r, sigma):
-    if T <= 0 or T < 1e-10:  
-        return 0  
-    d2 = (np.log(S/K) + (r - 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-    return np.exp(-r * T) * norm.pdf(d2) / (S * sigma * np.sqrt(T))
+np.random.seed(42)
 
 K = 100 
 r = 0.05  
@@ -27,9 +17,9 @@ spot_prices = np.linspace(95, 105, 1000)
 
 plt.figure(figsize=(12, 8))
 
-for days in time_scenarios:
-    T = days / 365  # Convert days to years
-    deltas = [digital_option_delta(S, K, T, r, sigma) for S in spot_prices]
+# One call for the whole (maturity x spot) grid
+delta_grid = binary_option(spot_prices[None, :], K, np.array(time_scenarios)[:, None] / 365, r, sigma)['delta']
+for days, deltas in zip(time_scenarios, delta_grid):
     plt.plot(spot_prices, deltas, label=f'{days} days to maturity')
 
 plt.axvline(x=K, color='gray', linestyle='--', alpha=0.7)
@@ -41,43 +31,18 @@ plt.legend()
 plt.grid(True, alpha=0.3)
 
 def simulate_digital_option_hedging(S0, K, T_days, r, sigma, num_simulations=1):
-    T = T_days / 365
-    
+    # All simulations and time points at once: (num_simulations x 50) arrays
     remaining_days = np.linspace(T_days, 0, 50)
     time_points = remaining_days / 365
-    
-    spot_paths = []
-    delta_paths = []
-    price_paths = []
-    
-    for sim in range(num_simulations):
-        S = S0
-        spot_path = [S]
-        delta_path = [digital_option_delta(S, K, T, r, sigma)]
-        price_path = [digital_option_price(S, K, T, r, sigma)]
-        
-        for i in range(1, len(time_points)):
-            dt = time_points[i-1] - time_points[i]
-            dW = np.random.normal(0, np.sqrt(dt))
-            S = S * np.exp((r - 0.5 * sigma**2) * dt + sigma * dW)
-            spot_path.append(S)
-            
-            t_remaining = time_points[i]
-            if t_remaining <= 0:
-                delta = 0  # Delta is undefined at maturity
-                price = 1.0 if S > K else 0.0
-            else:
-                delta = digital_option_delta(S, K, t_remaining, r, sigma)
-                price = digital_option_price(S, K, t_remaining, r, sigma)
-            
-            delta_path.append(delta)
-            price_path.append(price)
-        
-        spot_paths.append(spot_path)
-        delta_paths.append(delta_path)
-        price_paths.append(price_path)
-    
-    return remaining_days, spot_paths, delta_paths, price_paths
+    dt = -np.diff(time_points)
+
+    dW = np.random.normal(0, 1, (num_simulations, len(dt))) * np.sqrt(dt)
+    log_returns = (r - 0.5 * sigma**2) * dt + sigma * dW
+    spot_paths = S0 * np.exp(np.hstack([np.zeros((num_simulations, 1)), np.cumsum(log_returns, axis=1)]))
+
+    # At maturity the price is the payoff and the delta is set to 0 (undefined)
+    greeks = binary_option(spot_paths, K, time_points, r, sigma)
+    return remaining_days, spot_paths, greeks['delta'], greeks['price']
 
 plt.figure(figsize=(12, 10))
 
@@ -120,15 +85,18 @@ plt.figure(figsize=(12, 6))
 T_tiny = 0.5 / 365  # Half a day to maturity
 very_fine_spots = np.linspace(99.5, 100.5, 1000)  # Very narrow range around strike
 
-deltas_tiny = [digital_option_delta(S, K, T_tiny, r, sigma) for S in very_fine_spots]
+deltas_tiny = binary_option(very_fine_spots, K, T_tiny, r, sigma)['delta']
+
+spread_width = 0.2  # Call-spread replication: bounded, smoother hedge delta
+spread_deltas = call_spread_digital(very_fine_spots, K, T_tiny, r, sigma, spread_width)['delta']
 
-plt.plot(very_fine_spots, deltas_tiny)
+plt.plot(very_fine_spots, deltas_tiny, label='Digital')
+plt.plot(very_fine_spots, spread_deltas, linestyle='--', label=f'Call spread (width {spread_width})')
 plt.axvline(x=K, color='red', linestyle='--', alpha=0.7, label='Strike')
 
 S1 = 99.95
 S2 = 100.05
-delta1 = digital_option_delta(S1, K, T_tiny, r, sigma)
-delta2 = digital_option_delta(S2, K, T_tiny, r, sigma)
+delta1, delta2 = binary_option([S1, S2], K, T_tiny, r, sigma)['delta']
 
 plt.scatter([S1, S2], [delta1, delta2], color='red', s=50)
 plt.annotate(f'S={S1}, Δ={delta1:.2f}', (S1, delta1), textcoords="offset points", 
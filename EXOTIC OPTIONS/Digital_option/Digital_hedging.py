@@ -0,0 +1,121 @@
+import time
+import numpy as np
+import pandas as pd
+
+from Digital_pricer import binary_option, call_spread_digital
+
+# Largest shared simulation grid (steps per path); 5,000 steps are 400 MB per 10,000-path chunk
+MAX_GRID_STEPS = 5_000
+
+
+def simulate_digital_hedging(S0, K, T_days, r, sigma, rebalances=(10, 50, 250), n_paths=100_000, cost=0.0,
+                             payout=1.0, mu=None, spread_width=None, pin_band=0.01, seed=None, chunk_size=10_000):
+    """Delta hedging of a short cash-or-nothing call, for several rebalance frequencies on the same paths.
+
+    Paths are simulated once (drift `mu`, default r) on a grid fine enough for
+    every frequency in `rebalances` (their least common multiple); a frequency
+    of n rebalances uses every (grid / n)-th point, so frequencies are compared
+    on shared random numbers. If the least common multiple exceeds
+    MAX_GRID_STEPS, the grid is the finest frequency instead and coarser ones
+    rebalance on the nearest grid dates. Each step is an array operation over a chunk of
+    paths. The seller receives the Black-Scholes premium, holds delta shares
+    (rebalanced n times, unwound at expiry), pays proportional transaction costs
+    `cost` on traded notional and the payoff; all cash flows are discounted to 0.
+    With `spread_width` the premium and hedge ratios come from the over-hedging
+    call spread of that width instead of the digital (bounded delta near expiry).
+
+    Returns a summary DataFrame (one row per frequency: P&L mean, std, 1% VaR and
+    expected shortfall, mean costs, pin-risk statistics for paths ending within
+    `pin_band` of the strike) and a dict of the P&L arrays.
+    """
+    rebalances = tuple(int(n) for n in rebalances)
+    if max(rebalances) > MAX_GRID_STEPS:
+        raise ValueError(f"at most {MAX_GRID_STEPS} rebalances are supported, got {max(rebalances)}")
+    n_fine = int(np.lcm.reduce(rebalances))
+    if n_fine > MAX_GRID_STEPS:
+        n_fine = max(rebalances)
+    T = T_days / 365
+    mu = r if mu is None else mu
+    dt = T / n_fine
+    t_fine = T * np.arange(n_fine + 1) / n_fine
+    rng = np.random.default_rng(seed)
+
+    def greek(name, S, tau):
+        if spread_width is None:
+            return binary_option(S, K, tau, r, sigma, greeks=(name,))[name]
+        return call_spread_digital(S, K, tau, r, sigma, spread_width, side='over', greeks=(name,))[name]
+
+    premium = payout * greek('price', S0, T)
+
+    pnl = {n: np.empty(n_paths) for n in rebalances}
+    costs = {n: np.empty(n_paths) for n in rebalances}
+    last_position = {n: np.empty(n_paths) for n in rebalances}
+    S_T = np.empty(n_paths)
+
+    for start in range(0, n_paths, chunk_size):
+        m = min(chunk_size, n_paths - start)
+        chunk = slice(start, start + m)
+        S = np.empty((m, n_fine + 1))
+        S[:, 0] = S0
+        S[:, 1:] = S0 * np.exp(np.cumsum((mu - 0.5 * sigma ** 2) * dt
+                                         + sigma * np.sqrt(dt) * rng.standard_normal((m, n_fine)), axis=1))
+        S_T[chunk] = S[:, -1]
+        payoff = payout * (S[:, -1] > K)
+
+        for n in rebalances:
+            idx = np.round(np.linspace(0, n_fine, n + 1)).astype(int)
+            S_k, t_k = S[:, idx], t_fine[idx]
+            delta = payout * greek('delta', S_k[:, :-1], T - t_k[:-1])
+            discounted_S = np.exp(-r * t_k) * S_k
+            gains = np.sum(delta * np.diff(discounted_S, axis=1), axis=1)
+            trades = np.abs(np.diff(delta, axis=1, prepend=0.0, append=0.0))
+            costs[n][chunk] = cost * np.sum(trades * discounted_S, axis=1)
+            pnl[n][chunk] = premium + gains - costs[n][chunk] - np.exp(-r * T) * payoff
+            last_position[n][chunk] = delta[:, -1] * S_k[:, -2]
+
+    pinned = np.abs(S_T / K - 1) < pin_band
+    rows = []
+    for n in rebalances:
+        x = pnl[n]
+        var_1 = np.quantile(x, 0.01)
+        rows.append({
+            'rebalances': n,
+            'mean_pnl': x.mean(),
+            'std_pnl': x.std(ddof=1),
+            'VaR_1%': -var_1,
+            'ES_1%': -x[x <= var_1].mean(),
+            'mean_cost': costs[n].mean(),
+            'std_pnl_pinned': x[pinned].std(ddof=1) if pinned.sum() > 1 else np.nan,
+            'std_pnl_away': x[~pinned].std(ddof=1),
+            'last_hedge_notional_pinned': last_position[n][pinned].mean() if pinned.any() else np.nan
+        })
+    summary = pd.DataFrame(rows).set_index('rebalances')
+    summary.attrs['pin_probability'] = pinned.mean()
+    summary.attrs['premium'] = float(premium)
+    return summary, pnl
+
+
+def main():
+    # Example usage: 30-day digital paying 100, 100k paths, four hedging frequencies with 5bp costs
+    start = time.perf_counter()
+    summary, pnl = simulate_digital_hedging(S0=100, K=100, T_days=30, r=0.05, sigma=0.2, payout=100,
+                                            rebalances=(6, 30, 120, 720), n_paths=100_000, cost=0.0005, seed=42)
+    print(f"100,000 paths x {list(summary.index)} rebalances: {time.perf_counter() - start:.1f}s")
+    print(f"Premium: {summary.attrs['premium']:.3f}, "
+          f"P(S_T within 1% of strike): {summary.attrs['pin_probability']:.2%}\n")
+    pd.set_option('display.width', 200)
+    pd.set_option('display.max_columns', None)
+    print(summary.round(3))
+
+    spread, _ = simulate_digital_hedging(S0=100, K=100, T_days=30, r=0.05, sigma=0.2, payout=100,
+                                         rebalances=(6, 30, 120, 720), n_paths=100_000, cost=0.0005,
+                                         spread_width=1.0, seed=42)
+    print(f"\nHedged as a 1-wide over-hedging call spread (premium {spread.attrs['premium']:.3f}):")
+    print(spread.round(3))
+    print("\nMore frequent rebalancing shrinks the hedge error away from the strike, but paths pinned at the"
+          "\nstrike keep a large residual error and carry the largest hedge positions into expiry; the call"
+          "\nspread caps those positions at the cost of a higher premium.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import time
+import numpy as np
+from scipy.special import ndtr
+
+GREEKS = ('price', 'delta', 'gamma', 'vega', 'theta', 'rho')
+SPREAD_SIDES = ('center', 'over', 'under')
+
+
+def _pdf(x):
+    return np.exp(-0.5 * x * x) / np.sqrt(2 * np.pi)
+
+
+def binary_option(S, K, T, r, sigma, kind='cash', option='call', q=0.0, greeks=GREEKS):
+    """Black-Scholes cash-or-nothing (pays 1) or asset-or-nothing (pays S_T) option with its Greeks.
+
+    Every argument broadcasts, so a spot x maturity grid is one call; only the
+    names listed in `greeks` are computed. Expired entries (T <= 0) are handled
+    with masks: the price is the payoff and the Greeks are its derivatives away
+    from the strike (zero, except the delta of 1 of an in-the-money
+    asset-or-nothing). Theta is -dV/dT, rho is dV/dr. Returns a dict.
+    """
+    if kind not in ('cash', 'asset') or option not in ('call', 'put'):
+        raise ValueError("kind must be 'cash' or 'asset' and option 'call' or 'put'")
+    S, K, T, r, sigma, q = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S, K, T, r, sigma, q)))
+    live = T > 0
+    tau = np.where(live, T, 1.0)
+    sqrt_tau = np.sqrt(tau)
+    sd = sigma * sqrt_tau
+    d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * tau) / sd
+    d2 = d1 - sd
+    sign = 1.0 if option == 'call' else -1.0
+
+    if kind == 'cash':
+        # V = e^{-rT} N(+-d2)
+        discount = np.exp(-r * tau)
+        pdf = sign * discount * _pdf(d2)
+        price = lambda: discount * ndtr(sign * d2)
+        formulas = {
+            'price': price,
+            'delta': lambda: pdf / (S * sd),
+            'gamma': lambda: -pdf * d1 / (S ** 2 * sd ** 2),
+            'vega': lambda: -pdf * d1 / sigma,
+            'theta': lambda: r * price() - pdf * ((r - q - 0.5 * sigma ** 2) / sd - d2 / (2 * tau)),
+            'rho': lambda: -tau * price() + pdf * sqrt_tau / sigma,
+        }
+        expired_delta = 0.0
+    else:
+        # V = S e^{-qT} N(+-d1)
+        dividend = np.exp(-q * tau)
+        pdf = sign * S * dividend * _pdf(d1)
+        formulas = {
+            'price': lambda: S * dividend * ndtr(sign * d1),
+            'delta': lambda: dividend * ndtr(sign * d1) + pdf / (S * sd),
+            'gamma': lambda: -pdf * d2 / (S ** 2 * sd ** 2),
+            'vega': lambda: -pdf * d2 / sigma,
+            'theta': lambda: q * S * dividend * ndtr(sign * d1) - pdf * ((r - q + 0.5 * sigma ** 2) / sd - d1 / (2 * tau)),
+            'rho': lambda: pdf * sqrt_tau / sigma,
+        }
+        expired_delta = 1.0
+
+    in_the_money = (S > K) if option == 'call' else (S < K)
+    expired = {
+        'price': in_the_money * (1.0 if kind == 'cash' else S),
+        'delta': in_the_money * expired_delta,
+    }
+    return {name: np.where(live, formulas[name](), expired.get(name, 0.0)) for name in greeks}
+
+
+def gap_option(S, K_payoff, K_trigger, T, r, sigma, option='call', q=0.0, greeks=GREEKS):
+    """Gap option: pays S_T - K_payoff if S_T > K_trigger (call), K_payoff - S_T if S_T < K_trigger (put).
+
+    Built from the binaries at the trigger: call = asset - K_payoff * cash,
+    put = K_payoff * cash - asset. K_payoff = K_trigger is the vanilla option.
+    """
+    asset = binary_option(S, K_trigger, T, r, sigma, 'asset', option, q, greeks)
+    cash = binary_option(S, K_trigger, T, r, sigma, 'cash', option, q, greeks)
+    sign = 1.0 if option == 'call' else -1.0
+    K_payoff = np.asarray(K_payoff, dtype=float)
+    return {name: sign * (asset[name] - K_payoff * cash[name]) for name in greeks}
+
+
+def vanilla_option(S, K, T, r, sigma, option='call', q=0.0, greeks=GREEKS):
+    """Black-Scholes vanilla price and Greeks (a gap option with equal strikes)"""
+    return gap_option(S, K, K, T, r, sigma, option, q, greeks)
+
+
+def call_spread_digital(S, K, T, r, sigma, width, option='call', q=0.0, side='center', greeks=GREEKS):
+    """Cash-or-nothing digital replicated by a spread of vanillas of strike distance `width`.
+
+    (C(K_lo) - C(K_hi)) / width for a call, (P(K_hi) - P(K_lo)) / width for a
+    put. side='center' straddles K; 'over' places the spread so its payoff
+    dominates the digital (K_lo = K - width for a call, the seller's hedge) and
+    'under' so it is dominated. The Greeks stay bounded by ~1 / width as
+    T -> 0, unlike the digital's, which is what makes them usable for hedging.
+    """
+    if side not in SPREAD_SIDES:
+        raise ValueError(f"side must be one of {SPREAD_SIDES}")
+    K, width = np.asarray(K, dtype=float), np.asarray(width, dtype=float)
+    shift = {'center': 0.5, 'over': 1.0, 'under': 0.0}[side]
+    if option == 'put':
+        shift = 1.0 - shift
+    K_lo = K - shift * width
+    K_hi = K_lo + width
+    lo = vanilla_option(S, K_lo, T, r, sigma, option, q, greeks)
+    hi = vanilla_option(S, K_hi, T, r, sigma, option, q, greeks)
+    sign = 1.0 if option == 'call' else -1.0
+    return {name: sign * (lo[name] - hi[name]) / width for name in greeks}
+
+
+def main():
+    # Example usage: the 1000 spots x 5 maturities delta grid in one call, plus digital vs call-spread Greeks
+    K, r, sigma = 100, 0.05, 0.2
+    spots = np.linspace(95, 105, 1000)[None, :]
+    days = np.array([30, 7, 1, 0.5, 0.1, 0.0])[:, None]
+    start = time.perf_counter()
+    grid = binary_option(spots, K, days / 365, r, sigma)
+    print(f"{grid['delta'].size} digital prices and Greeks in {1000 * (time.perf_counter() - start):.1f} ms")
+
+    S = np.array([99.5, 99.9, 100.0, 100.1, 100.5])
+    T = 0.1 / 365
+    print(f"\n0.1 day to expiry, spots {S}")
+    rows = [('digital', binary_option(S, K, T, r, sigma))] + [
+        (f'call spread w={w} ({side})', call_spread_digital(S, K, T, r, sigma, w, side=side))
+        for w, side in [(0.2, 'center'), (1.0, 'center'), (1.0, 'over')]]
+    for greek in ('price', 'delta', 'gamma'):
+        print(greek)
+        for label, values in rows:
+            print(f"  {label:<28}{np.array2string(values[greek], precision=3, suppress_small=True)}")
+
+    # Consistency: gap with equal strikes = vanilla, call - put parities
+    gap = gap_option(100, 95, 100, 0.5, r, sigma)
+    parity = binary_option(100, K, 0.5, r, sigma)['price'] + binary_option(100, K, 0.5, r, sigma, option='put')['price']
+    print(f"\nGap call (pay S-95 if S>100): {float(gap['price']):.4f}, "
+          f"cash call + put = {float(parity):.6f} (e^-rT = {np.exp(-r * 0.5):.6f})")
+
+
+if __name__ == "__main__":
+    main()
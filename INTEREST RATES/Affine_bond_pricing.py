@@ -0,0 +1,143 @@
+import time
+import numpy as np
+
+from Short_rate_model_comparisons import vasicek_model, cir_model, hull_white_model
+
+MODELS = ('vasicek', 'cir', 'hull_white')
+
+
+def vasicek_affine(tau, kappa, theta, sigma):
+    """(log A, B) of the Vasicek bond price P = A exp(-B r) for time to maturity tau"""
+    tau = np.asarray(tau, dtype=float)
+    B = -np.expm1(-kappa * tau) / kappa
+    log_A = (theta - sigma**2 / (2 * kappa**2)) * (B - tau) - sigma**2 * B**2 / (4 * kappa)
+    return log_A, B
+
+
+def cir_affine(tau, kappa, theta, sigma):
+    """(log A, B) of the CIR bond price P = A exp(-B r) for time to maturity tau"""
+    tau = np.asarray(tau, dtype=float)
+    h = np.sqrt(kappa**2 + 2 * sigma**2)
+    growth = np.expm1(h * tau)
+    denominator = (h + kappa) * growth + 2 * h
+    B = 2 * growth / denominator
+    log_A = 2 * kappa * theta / sigma**2 * (np.log(2 * h / denominator) + 0.5 * (kappa + h) * tau)
+    return log_A, B
+
+
+def hull_white_affine(t, T, kappa, sigma, discount_curve=None, theta_t=None, h=1e-5, n_quad=2048):
+    """(log A, B) of the Hull-White bond price P(t, T) = A exp(-B r(t)), from a discount curve or a theta_t.
+
+    Fitted to P(0, .) = discount_curve:
+        log A = log(P(0, T) / P(0, t)) + B f(0, t) - sigma^2 / (4 kappa) (1 - exp(-2 kappa t)) B^2,
+    with the initial instantaneous forward f(0, t) taken by central differences of log P(0, .).
+    Driven by a mean reversion level theta_t(s), as in Short_rate_model_comparisons.hull_white_model:
+        log A = -int_t^T kappa theta(s) B(s, T) ds + sigma^2 / 2 int_t^T B(s, T)^2 ds,
+    the second integral in closed form and the first by a midpoint rule on n_quad sub-intervals whose
+    weights kappa int B(s, T) ds are exact (so a theta constant on each sub-interval is priced exactly).
+    """
+    if (discount_curve is None) == (theta_t is None):
+        raise ValueError("pass exactly one of discount_curve and theta_t")
+    t, T = np.asarray(t, dtype=float), np.asarray(T, dtype=float)
+    B = -np.expm1(-kappa * (T - t)) / kappa
+    if theta_t is not None:
+        tau = (T - t)[..., None]
+        edges = tau * np.arange(n_quad + 1) / n_quad       # distance from t
+        to_maturity = tau - edges                          # T - s at the sub-interval edges
+        weights = np.diff(edges, axis=-1) - np.diff(np.exp(-kappa * to_maturity), axis=-1) / kappa
+        midpoints = t[..., None] + 0.5 * (edges[..., 1:] + edges[..., :-1])
+        drift = np.sum(np.broadcast_to(theta_t(midpoints), midpoints.shape) * weights, axis=-1)
+        log_A = -drift + sigma**2 / 2 * ((T - t - B) / kappa**2 - B**2 / (2 * kappa))
+        return log_A, B
+    lower = np.maximum(t - h, 0.0)
+    forward = -(np.log(discount_curve(t + h)) - np.log(discount_curve(lower))) / (t + h - lower)
+    log_A = (np.log(discount_curve(T)) - np.log(discount_curve(t)) + B * forward
+             + sigma**2 / (4 * kappa) * np.expm1(-2 * kappa * t) * B**2)
+    return log_A, B
+
+
+def bond_prices(model, rates, maturities, t=0.0, **params):
+    """Zero-coupon bond prices, one row per short rate and one column per maturity (years from t).
+
+    A single broadcast exp(log A - B r) turns every simulated short rate into a
+    full discount curve. params are kappa, theta, sigma for Vasicek and CIR,
+    and kappa, sigma and either discount_curve or theta_t for Hull-White.
+    """
+    if model not in MODELS:
+        raise ValueError(f"model must be one of {MODELS}")
+    rates = np.asarray(rates, dtype=float)[..., None]
+    tau = np.asarray(maturities, dtype=float)
+    if model == 'vasicek':
+        log_A, B = vasicek_affine(tau, **params)
+    elif model == 'cir':
+        log_A, B = cir_affine(tau, **params)
+    else:
+        log_A, B = hull_white_affine(t, t + tau, **params)
+    return np.exp(log_A - B * rates)
+
+
+def yield_curves(model, rates, maturities, t=0.0, **params):
+    """Continuously compounded zero yields -log P / tau, (rates x maturities); tau = 0 gives the short rate"""
+    tau = np.asarray(maturities, dtype=float)
+    log_prices = np.log(bond_prices(model, rates, tau, t, **params))
+    short = np.broadcast_to(np.asarray(rates, dtype=float)[..., None], log_prices.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(tau > 0, -log_prices / tau, short)
+
+
+def main():
+    # Example usage: parameters of Short_rate_model_comparisons.py, curves out to 30 years
+    r0, kappa, theta, sigma = 0.03, 0.5, 0.05, 0.02
+    maturities = np.array([0.0, 0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 30])
+    spot_rates = np.array([0.0, 0.03, 0.05, 0.08])
+    for model, params in [('vasicek', dict(kappa=kappa, theta=theta, sigma=sigma)),
+                          ('cir', dict(kappa=kappa, theta=theta, sigma=0.1))]:
+        curves = yield_curves(model, spot_rates, maturities, **params)
+        print(f"{model} zero yields (rows r = {spot_rates}, maturities {maturities[[1, 4, 8, -1]]}y):")
+        print(np.round(100 * curves[:, [1, 4, 8, -1]], 3))
+
+    # Hull-White fitted to today's Vasicek curve reproduces Vasicek prices in every state
+    def initial_curve(T):
+        log_A, B = vasicek_affine(T, kappa, theta, sigma)
+        return np.exp(log_A - B * r0)
+    hw = bond_prices('hull_white', spot_rates, maturities, t=2.0, kappa=kappa, sigma=sigma, discount_curve=initial_curve)
+    vas = bond_prices('vasicek', spot_rates, maturities, kappa=kappa, theta=theta, sigma=sigma)
+    print(f"\nHull-White on the Vasicek initial curve vs Vasicek: max |dP| = {np.max(np.abs(hw - vas)):.1e}")
+
+    # Scenario engine: exact 1-year short-rate scenarios, each turned into a full curve in one array operation
+    n_scenarios = 10_000
+    curve_grid = np.linspace(0.25, 30, 120)
+    start = time.perf_counter()
+    # Hull-White with the mean reversion level of hull_white_model (4%, 6% after 5 years), 10 steps to 10y
+    def hw_theta(s):
+        return np.where(s < 5.0, 0.04, 0.06)
+    vasicek_r = vasicek_model(r0, kappa, theta, sigma, 1.0, 1, n_scenarios)[:, -1]
+    cir_r = cir_model(r0, kappa, theta, 0.1, 1.0, 1, n_scenarios)[:, -1]
+    hw_paths, _ = hull_white_model(r0, kappa, sigma, 10.0, 10, n_scenarios, theta_t=hw_theta)
+    simulated = time.perf_counter() - start
+    start = time.perf_counter()
+    vasicek_curves = yield_curves('vasicek', vasicek_r, curve_grid, kappa=kappa, theta=theta, sigma=sigma)
+    cir_curves = yield_curves('cir', cir_r, curve_grid, kappa=kappa, theta=theta, sigma=0.1)
+    hw_curves = yield_curves('hull_white', hw_paths[:, 1], curve_grid, t=1.0, kappa=kappa, sigma=sigma,
+                             theta_t=hw_theta)
+    print(f"\n{n_scenarios:,} short-rate scenarios per model in {1000 * simulated:.1f} ms, "
+          f"{3 * vasicek_curves.size:,} curve points in {1000 * (time.perf_counter() - start):.1f} ms")
+    for name, curves in [('Vasicek', vasicek_curves), ('CIR', cir_curves), ('HW', hw_curves)]:
+        q05, q50, q95 = np.quantile(curves[:, [3, 39, -1]], [0.05, 0.5, 0.95], axis=0)
+        print(f"{name:<8} 1y / 10y / 30y yields in 1 year: median {np.round(100 * q50, 2)}%, "
+              f"5-95% [{np.round(100 * q05, 2)}, {np.round(100 * q95, 2)}]")
+
+    # The theta_t pricer is consistent with the simulated paths: P(0, T) = E[exp(-int_0^t r) P(t, T)]
+    hw_fine, _ = hull_white_model(r0, kappa, sigma, 10.0, 500, 100_000, theta_t=hw_theta, rng=np.random.default_rng(0))
+    t_index, step = 100, 10.0 / 500
+    integral = step * (hw_fine[:, :t_index + 1].sum(axis=1) - 0.5 * (hw_fine[:, 0] + hw_fine[:, t_index]))
+    later = np.array([3.0, 6.0, 8.0])
+    mc = np.exp(-integral)[:, None] * bond_prices('hull_white', hw_fine[:, t_index], later - 2.0, t=2.0,
+                                                    kappa=kappa, sigma=sigma, theta_t=hw_theta)
+    today = bond_prices('hull_white', r0, later, kappa=kappa, sigma=sigma, theta_t=hw_theta)
+    print(f"\nHull-White (theta_t) P(0, T) for T = {later}: closed form {np.round(today, 5)}, "
+          f"MC over simulated paths {np.round(mc.mean(axis=0), 5)} ± {np.round(mc.std(axis=0) / np.sqrt(len(mc)), 5)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.ticker import PercentFormatter
+from scipy.signal import lfilter
 from scipy.stats import norm
 import seaborn as sns
 
@@ -9,10 +10,8 @@ sns.set_context("talk")
 plt.rcParams['figure.figsize'] = (14, 10)
 plt.rcParams['lines.linewidth'] = 2.5
 
-np.random.seed(42)
-
-T = 10.0         # Tears
-N = 1000        
+T = 10.0         # Years
+N = 1000         # Steps for the path plots; the exact schemes need no fine grid
 dt = T / N       
 paths = 5      
 
@@ -23,184 +22,223 @@ sigma = 0.02
 
 time_grid = np.linspace(0, T, N+1)
 
-def vasicek_model(r0, kappa, theta, sigma, T, N, paths):
+CIR_SCHEMES = ('exact', 'qe')
+
+def _ou_paths(r0, kappa, drifts, sigma, T, N, paths, rng=None):
+    # Exact Gaussian OU transition over each step:
+    #   r(t+dt) = a r(t) + drift(t) + sigma sqrt((1 - a^2) / (2 kappa)) Z,  a = exp(-kappa dt)
+    # with drift(t) = kappa * int_t^{t+dt} exp(-kappa (t+dt-s)) theta(s) ds, i.e. (1 - a) theta for constant theta.
+    # The AR(1) recursion runs over all paths at once through lfilter.
+    rng = np.random if rng is None else rng
     dt = T / N
-    r = np.zeros((paths, N+1))
+    a = np.exp(-kappa * dt)
+    step_sd = sigma * np.sqrt((1 - a**2) / (2 * kappa))
+    shocks = np.asarray(drifts, dtype=float)[:N] + step_sd * rng.standard_normal((paths, N))
+    r = np.empty((paths, N+1))
     r[:, 0] = r0
-    for i in range(paths):
-        dW = np.random.normal(0, np.sqrt(dt), N)
-        for t in range(N):
-            dr = kappa * (theta - r[i, t]) * dt + sigma * dW[t]
-            r[i, t+1] = r[i, t] + dr
+    r[:, 1:] = lfilter([1.0], [1.0, -a], shocks, axis=1, zi=np.full((paths, 1), a * r0))[0]
     return r
 
-def cir_model(r0, kappa, theta, sigma, T, N, paths):
+def _ou_drifts(theta_t, kappa, T, N, n_quad=64):
+    # kappa * int_t^{t+dt} exp(-kappa (t+dt-s)) theta(s) ds for every step: composite midpoint rule on n_quad
+    # sub-intervals with the exponential weights integrated exactly, so a theta that is constant on each
+    # sub-interval (e.g. piecewise constant with changes on the sub-grid) gives the exact conditional mean
     dt = T / N
-    r = np.zeros((paths, N+1))
+    h = dt / n_quad
+    starts = h * np.arange(n_quad)
+    weights = np.exp(-kappa * (dt - starts - h)) - np.exp(-kappa * (dt - starts))
+    midpoints = dt * np.arange(N)[:, None] + starts + h / 2
+    return np.broadcast_to(theta_t(midpoints), midpoints.shape).astype(float) @ weights
+
+def vasicek_model(r0, kappa, theta, sigma, T, N, paths, rng=None):
+    return _ou_paths(r0, kappa, np.full(N, theta * -np.expm1(-kappa * T / N)), sigma, T, N, paths, rng)
+
+def cir_model(r0, kappa, theta, sigma, T, N, paths, scheme='exact', rng=None):
+    # 'exact': r(t+dt) = c X, X noncentral chi-square with 4 kappa theta / sigma^2 degrees of freedom
+    #          and noncentrality r(t) exp(-kappa dt) / c, c = sigma^2 (1 - exp(-kappa dt)) / (4 kappa)
+    # 'qe':    Andersen's quadratic-exponential scheme, matching the first two moments of that law
+    if scheme not in CIR_SCHEMES:
+        raise ValueError(f"scheme must be one of {CIR_SCHEMES}")
+    rng = np.random if rng is None else rng
+    dt = T / N
+    a = np.exp(-kappa * dt)
+    c = sigma**2 * (1 - a) / (4 * kappa)
+    df = 4 * kappa * theta / sigma**2
+    r = np.empty((paths, N+1))
     r[:, 0] = r0
-    for i in range(paths):
-        dW = np.random.normal(0, np.sqrt(dt), N)
-        for t in range(N):
-            dr = kappa * (theta - r[i, t]) * dt + sigma * np.sqrt(max(r[i, t], 0)) * dW[t]
-            r[i, t+1] = max(r[i, t] + dr, 0)  # Ensure rates don't go negative
+    for t in range(N):
+        current = r[:, t]
+        if scheme == 'exact':
+            r[:, t+1] = c * rng.noncentral_chisquare(df, current * a / c)
+            continue
+        m = theta + (current - theta) * a
+        s2 = current * sigma**2 * a * (1 - a) / kappa + theta * sigma**2 * (1 - a)**2 / (2 * kappa)
+        psi = s2 / m**2
+        quadratic = psi <= 1.5
+        inv_psi = 2 / np.minimum(psi, 1.5)
+        b2 = inv_psi - 1 + np.sqrt(inv_psi) * np.sqrt(inv_psi - 1)
+        z = rng.standard_normal(paths)
+        p = (np.maximum(psi, 1.5) - 1) / (np.maximum(psi, 1.5) + 1)
+        u = rng.random(paths)
+        exponential = np.where(u <= p, 0.0, np.log((1 - p) / np.maximum(1 - u, 1e-300)) * m / (1 - p))
+        r[:, t+1] = np.where(quadratic, m / (1 + b2) * (np.sqrt(b2) + z)**2, exponential)
     return r
 
-def hull_white_model(r0, kappa, sigma, T, N, paths):
-    dt = T / N
-    r = np.zeros((paths, N+1))
-    r[:, 0] = r0
+def hull_white_model(r0, kappa, sigma, T, N, paths, theta_t=None, rng=None):
+    # Exact transitions for any step size: the time-dependent mean reversion level enters through the
+    # integrated drift of _ou_drifts, not through theta at the start of each step
+    time_grid = np.linspace(0, T, N+1)
+
+    if theta_t is None:
+        def theta_t(t):
+            return np.where(t < T/2, 0.04, 0.06)  # 4% initially, 6% later
+
+    theta_values = np.broadcast_to(theta_t(time_grid), time_grid.shape).astype(float)
+    return _ou_paths(r0, kappa, _ou_drifts(theta_t, kappa, T, N), sigma, T, N, paths, rng), theta_values
+
+def main():
+    np.random.seed(42)
 
-    def theta_t(t):
-        if t < T/2:
-            return 0.04  # 4% initially
-        else:
-            return 0.06  # 6% later
-    
-    theta_values = np.array([theta_t(t) for t in time_grid])
+    vasicek_paths = vasicek_model(r0, kappa, theta, sigma, T, N, paths)
+    cir_paths = cir_model(r0, kappa, theta, sigma, T, N, paths)
+    hull_white_paths, hw_theta = hull_white_model(r0, kappa, sigma, T, N, paths)
+
+
+    # Vasicek Model
+    fig_vasicek = plt.figure(figsize=(12, 8))
+    ax_vasicek = fig_vasicek.add_subplot(111)
+    for i in range(paths):
+        ax_vasicek.plot(time_grid, vasicek_paths[i], alpha=0.8)
+    ax_vasicek.axhline(y=theta, color='r', linestyle='--', label=f'Long-term mean rate ({theta:.1%})')
+    ax_vasicek.axhline(y=0, color='black', linestyle='-', alpha=0.3)
+    ax_vasicek.set_title('Vasicek Model Sample Paths')
+    ax_vasicek.set_ylabel('Short Rate (r)')
+    ax_vasicek.set_xlabel('Time (years)')
+    ax_vasicek.yaxis.set_major_formatter(PercentFormatter(1.0))
+    ax_vasicek.grid(True)
+    ax_vasicek.legend()
+    ax_vasicek.annotate('Can go negative', xy=(8, -0.01), xytext=(6, -0.03),
+                     arrowprops=dict(facecolor='black', shrink=0.05, width=1.5, headwidth=8))
+
+    props = dict(boxstyle='round', facecolor='wheat', alpha=0.3)
+    ax_vasicek.text(0.02, 0.95, r'$dr(t) = \kappa(\theta - r(t))dt + \sigma dW(t)$', 
+                    transform=ax_vasicek.transAxes, fontsize=12,
+                    verticalalignment='top', bbox=props)
+
+    plt.tight_layout()
+    plt.savefig('vasicek_model.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+    # CIR Model
+    fig_cir = plt.figure(figsize=(12, 8))
+    ax_cir = fig_cir.add_subplot(111)
     for i in range(paths):
-        dW = np.random.normal(0, np.sqrt(dt), N)
-        for t in range(N):
-            theta_current = theta_values[t]
-            dr = kappa * (theta_current - r[i, t]) * dt + sigma * dW[t]
-            r[i, t+1] = r[i, t] + dr
-    return r, theta_values
-
-vasicek_paths = vasicek_model(r0, kappa, theta, sigma, T, N, paths)
-cir_paths = cir_model(r0, kappa, theta, sigma, T, N, paths)
-hull_white_paths, hw_theta = hull_white_model(r0, kappa, sigma, T, N, paths)
-
-
-# Vasicek Model
-fig_vasicek = plt.figure(figsize=(12, 8))
-ax_vasicek = fig_vasicek.add_subplot(111)
-for i in range(paths):
-    ax_vasicek.plot(time_grid, vasicek_paths[i], alpha=0.8)
-ax_vasicek.axhline(y=theta, color='r', linestyle='--', label=f'Long-term mean rate ({theta:.1%})')
-ax_vasicek.axhline(y=0, color='black', linestyle='-', alpha=0.3)
-ax_vasicek.set_title('Vasicek Model Sample Paths')
-ax_vasicek.set_ylabel('Short Rate (r)')
-ax_vasicek.set_xlabel('Time (years)')
-ax_vasicek.yaxis.set_major_formatter(PercentFormatter(1.0))
-ax_vasicek.grid(True)
-ax_vasicek.legend()
-ax_vasicek.annotate('Can go negative', xy=(8, -0.01), xytext=(6, -0.03),
-                 arrowprops=dict(facecolor='black', shrink=0.05, width=1.5, headwidth=8))
-
-props = dict(boxstyle='round', facecolor='wheat', alpha=0.3)
-ax_vasicek.text(0.02, 0.95, r'$dr(t) = \kappa(\theta - r(t))dt + \sigma dW(t)$', 
-                transform=ax_vasicek.transAxes, fontsize=12,
+        ax_cir.plot(time_grid, cir_paths[i], alpha=0.8)
+    ax_cir.axhline(y=theta, color='r', linestyle='--', label=f'Long-term mean rate ({theta:.1%})')
+    ax_cir.set_title('CIR Model Sample Paths')
+    ax_cir.set_ylabel('Short Rate (r)')
+    ax_cir.set_xlabel('Time (years)')
+    ax_cir.yaxis.set_major_formatter(PercentFormatter(1.0))
+    ax_cir.grid(True)
+    ax_cir.legend()
+    ax_cir.annotate('Non-negative', xy=(8, 0.01), xytext=(6, 0.03),
+                   arrowprops=dict(facecolor='black', shrink=0.05, width=1.5, headwidth=8))
+
+    ax_cir.text(0.02, 0.95, r'$dr(t) = \kappa(\theta - r(t))dt + \sigma\sqrt{r(t)} dW(t)$', 
+                transform=ax_cir.transAxes, fontsize=12,
                 verticalalignment='top', bbox=props)
 
-plt.tight_layout()
-plt.savefig('vasicek_model.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-
-# CIR Model
-fig_cir = plt.figure(figsize=(12, 8))
-ax_cir = fig_cir.add_subplot(111)
-for i in range(paths):
-    ax_cir.plot(time_grid, cir_paths[i], alpha=0.8)
-ax_cir.axhline(y=theta, color='r', linestyle='--', label=f'Long-term mean rate ({theta:.1%})')
-ax_cir.set_title('CIR Model Sample Paths')
-ax_cir.set_ylabel('Short Rate (r)')
-ax_cir.set_xlabel('Time (years)')
-ax_cir.yaxis.set_major_formatter(PercentFormatter(1.0))
-ax_cir.grid(True)
-ax_cir.legend()
-ax_cir.annotate('Non-negative', xy=(8, 0.01), xytext=(6, 0.03),
-               arrowprops=dict(facecolor='black', shrink=0.05, width=1.5, headwidth=8))
-
-ax_cir.text(0.02, 0.95, r'$dr(t) = \kappa(\theta - r(t))dt + \sigma\sqrt{r(t)} dW(t)$', 
-            transform=ax_cir.transAxes, fontsize=12,
-            verticalalignment='top', bbox=props)
-
-plt.tight_layout()
-plt.savefig('cir_model.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-
-# Hull-White Model
-fig_hw = plt.figure(figsize=(12, 8))
-ax_hw = fig_hw.add_subplot(111)
-
-for i in range(paths):
-    ax_hw.plot(time_grid, hull_white_paths[i], alpha=0.8)
-ax_hw.plot(time_grid, hw_theta, 'r--', label='Time-varying mean')
-ax_hw.axhline(y=0, color='black', linestyle='-', alpha=0.3)
-ax_hw.set_title('Hull-White Model Sample Paths')
-ax_hw.set_xlabel('Time (years)')
-ax_hw.set_ylabel('Short Rate (r)')
-ax_hw.yaxis.set_major_formatter(PercentFormatter(1.0))
-ax_hw.grid(True)
-ax_hw.legend()
-ax_hw.annotate('Time-dependent\nlong-term mean', xy=(5, hw_theta[500]+0.01), xytext=(3, hw_theta[500]+0.03),
-               arrowprops=dict(facecolor='black', shrink=0.05, width=1.5, headwidth=8))
-ax_hw.text(0.02, 0.95, r'$dr(t) = \kappa(\theta(t) - r(t))dt + \sigma dW(t)$', 
-           transform=ax_hw.transAxes, fontsize=12,
-           verticalalignment='top', bbox=props)
-
-plt.tight_layout()
-plt.savefig('hull_white_model.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-plt.figure(figsize=(14, 8))
-
-many_paths = 1000
-vasicek_many = vasicek_model(r0, kappa, theta, sigma, T, N, many_paths)
-cir_many = cir_model(r0, kappa, theta, sigma, T, N, many_paths)
-hull_white_many, _ = hull_white_model(r0, kappa, sigma, T, N, many_paths)
-
-# Terminal distributions
-sns.kdeplot(vasicek_many[:, -1], label='Vasicek', fill=True, alpha=0.3)
-sns.kdeplot(cir_many[:, -1], label='CIR', fill=True, alpha=0.3)
-sns.kdeplot(hull_white_many[:, -1], label='Hull-White', fill=True, alpha=0.3)
-
-plt.axvline(x=theta, color='r', linestyle='--', label=f'Long-term mean rate ({theta:.1%})')
-plt.axvline(x=0, color='black', linestyle='-', alpha=0.3)
-plt.title(f'Terminal Distribution of Short Rates at T={T}')
-plt.xlabel('Short Rate (r)')
-plt.ylabel('Density')
-plt.gca().xaxis.set_major_formatter(PercentFormatter(1.0))
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.savefig('short_rate_terminal_distributions.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-plt.figure(figsize=(14, 8))
-
-
-window = 50  # Rolling window size
-v_vol = np.zeros((paths, N-window+1))
-c_vol = np.zeros((paths, N-window+1))
-hw_vol = np.zeros((paths, N-window+1))
-
-for i in range(paths):
-    for t in range(N-window+1):
-        v_vol[i, t] = np.std(np.diff(vasicek_paths[i, t:t+window]))
-        c_vol[i, t] = np.std(np.diff(cir_paths[i, t:t+window]))
-        hw_vol[i, t] = np.std(np.diff(hull_white_paths[i, t:t+window]))
-
-plt.plot(time_grid[window:], np.mean(v_vol, axis=0), label='Vasicek')
-plt.plot(time_grid[window:], np.mean(c_vol, axis=0), label='CIR')
-plt.plot(time_grid[window:], np.mean(hw_vol, axis=0), label='Hull-White')
-
-plt.title('Rolling Volatility Comparison')
-plt.xlabel('Time (years)')
-plt.ylabel('Rolling Volatility')
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.savefig('short_rate_volatility_comparison.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-print("Model Parameters:")
-print(f"Initial rate (r0): {r0:.2%}")
-print(f"Mean reversion speed (kappa): {kappa:.2f}")
-print(f"Long-term mean rate (theta): {theta:.2%}")
-print(f"Volatility (sigma): {sigma:.2%}")
-print("\nKey Model Characteristics:")
-print("1. Vasicek: Constant volatility, can have negative rates")
-print("2. CIR: Square-root diffusion process, non-negative rates")
-print("3. Hull-White: Time-varying drift, extension of Vasicek")
+    plt.tight_layout()
+    plt.savefig('cir_model.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+    # Hull-White Model
+    fig_hw = plt.figure(figsize=(12, 8))
+    ax_hw = fig_hw.add_subplot(111)
+
+    for i in range(paths):
+        ax_hw.plot(time_grid, hull_white_paths[i], alpha=0.8)
+    ax_hw.plot(time_grid, hw_theta, 'r--', label='Time-varying mean')
+    ax_hw.axhline(y=0, color='black', linestyle='-', alpha=0.3)
+    ax_hw.set_title('Hull-White Model Sample Paths')
+    ax_hw.set_xlabel('Time (years)')
+    ax_hw.set_ylabel('Short Rate (r)')
+    ax_hw.yaxis.set_major_formatter(PercentFormatter(1.0))
+    ax_hw.grid(True)
+    ax_hw.legend()
+    ax_hw.annotate('Time-dependent\nlong-term mean', xy=(5, hw_theta[500]+0.01), xytext=(3, hw_theta[500]+0.03),
+                   arrowprops=dict(facecolor='black', shrink=0.05, width=1.5, headwidth=8))
+    ax_hw.text(0.02, 0.95, r'$dr(t) = \kappa(\theta(t) - r(t))dt + \sigma dW(t)$', 
+               transform=ax_hw.transAxes, fontsize=12,
+               verticalalignment='top', bbox=props)
+
+    plt.tight_layout()
+    plt.savefig('hull_white_model.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+    plt.figure(figsize=(14, 8))
+
+    # Exact transitions: a single step to T is unbiased for all three models
+    many_paths = 10000
+    vasicek_many = vasicek_model(r0, kappa, theta, sigma, T, 1, many_paths)
+    cir_many = cir_model(r0, kappa, theta, sigma, T, 1, many_paths)
+    hull_white_many, _ = hull_white_model(r0, kappa, sigma, T, 1, many_paths)
+
+    # Terminal distributions
+    sns.kdeplot(vasicek_many[:, -1], label='Vasicek', fill=True, alpha=0.3)
+    sns.kdeplot(cir_many[:, -1], label='CIR', fill=True, alpha=0.3)
+    sns.kdeplot(hull_white_many[:, -1], label='Hull-White', fill=True, alpha=0.3)
+
+    plt.axvline(x=theta, color='r', linestyle='--', label=f'Long-term mean rate ({theta:.1%})')
+    plt.axvline(x=0, color='black', linestyle='-', alpha=0.3)
+    plt.title(f'Terminal Distribution of Short Rates at T={T}')
+    plt.xlabel('Short Rate (r)')
+    plt.ylabel('Density')
+    plt.gca().xaxis.set_major_formatter(PercentFormatter(1.0))
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig('short_rate_terminal_distributions.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+    plt.figure(figsize=(14, 8))
+
+
+    window = 50  # Rolling window size
+    v_vol = np.zeros((paths, N-window+1))
+    c_vol = np.zeros((paths, N-window+1))
+    hw_vol = np.zeros((paths, N-window+1))
+
+    for i in range(paths):
+        for t in range(N-window+1):
+            v_vol[i, t] = np.std(np.diff(vasicek_paths[i, t:t+window]))
+            c_vol[i, t] = np.std(np.diff(cir_paths[i, t:t+window]))
+            hw_vol[i, t] = np.std(np.diff(hull_white_paths[i, t:t+window]))
+
+    plt.plot(time_grid[window:], np.mean(v_vol, axis=0), label='Vasicek')
+    plt.plot(time_grid[window:], np.mean(c_vol, axis=0), label='CIR')
+    plt.plot(time_grid[window:], np.mean(hw_vol, axis=0), label='Hull-White')
+
+    plt.title('Rolling Volatility Comparison')
+    plt.xlabel('Time (years)')
+    plt.ylabel('Rolling Volatility')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig('short_rate_volatility_comparison.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+    print("Model Parameters:")
+    print(f"Initial rate (r0): {r0:.2%}")
+    print(f"Mean reversion speed (kappa): {kappa:.2f}")
+    print(f"Long-term mean rate (theta): {theta:.2%}")
+    print(f"Volatility (sigma): {sigma:.2%}")
+    print("\nKey Model Characteristics:")
+    print("1. Vasicek: Constant volatility, can have negative rates")
+    print("2. CIR: Square-root diffusion process, non-negative rates")
+    print("3. Hull-White: Time-varying drift, extension of Vasicek")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import os
+import json
+import datetime as dt
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional, Tuple
+
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'MARKET_DATA_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+)
+
+# A source maps (tickers, start, end) to one OHLCV frame per ticker, end exclusive
+Source = Callable[[List[str], dt.date, dt.date], Dict[str, pd.DataFrame]]
+
+
+def yahoo_source(tickers: List[str], start: dt.date, end: dt.date) -> Dict[str, pd.DataFrame]:
+    """Download daily bars for several tickers in a single Yahoo Finance request"""
+    import yfinance as yf  # only needed when the store actually goes to the network
+
+    raw = yf.download(tickers, start=start, end=end, auto_adjust=False,
+                      group_by='ticker', progress=False)
+    frames = {}
+    for ticker in tickers:
+        if isinstance(raw.columns, pd.MultiIndex):
+            if ticker not in raw.columns.get_level_values(0):
+                continue
+            df = raw[ticker]
+        else:
+            df = raw
+        # Unknown or delisted tickers come back as all-NaN columns rather than an error
+        df = df.dropna(how='all')
+        if not df.empty:
+            frames[ticker] = df
+    return frames
+
+
+def csv_source(directory: str) -> Source:
+    """Source reading <directory>/<TICKER>.csv files (Date column + OHLCV columns)"""
+    def read(tickers: List[str], start: dt.date, end: dt.date) -> Dict[str, pd.DataFrame]:
+        frames = {}
+        for ticker in tickers:
+            path = os.path.join(directory, f"{ticker}.csv")
+            if not os.path.exists(path):
+                continue
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+            frames[ticker] = df[(df.index >= pd.Timestamp(start)) & (df.index < pd.Timestamp(end))]
+        return frames
+    return read
+
+
+def period_start(period: str, end: dt.date) -> dt.date:
+    """Translate a yfinance-style period ('5d', '6mo', '3y', 'max') into a start date"""
+    if period == 'max':
+        return dt.date(1970, 1, 1)
+    if period.endswith('mo'):
+        return (pd.Timestamp(end) - pd.DateOffset(months=int(period[:-2]))).date()
+    if period.endswith('y'):
+        return (pd.Timestamp(end) - pd.DateOffset(years=int(period[:-1]))).date()
+    if period.endswith('d'):
+        return end - dt.timedelta(days=int(period[:-1]))
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def _to_date(value) -> dt.date:
+    return pd.Timestamp(value).date()
+
+
+class MarketDataStore:
+    """On-disk columnar cache of daily bars.
+
+    Each ticker lives in its own directory with one .npy file per field plus the
+    dates, loaded memory-mapped. meta.json records the covered date range
+    [start, end) so repeated requests are served from disk and only the dates
+    outside that range are downloaded and appended. With offline=True (or the
+    MARKET_DATA_OFFLINE environment variable set) the source is never called.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 source: Optional[Source] = None,
+                 offline: Optional[bool] = None):
+        self.cache_dir = cache_dir
+        self.source = source if source is not None else yahoo_source
+        if offline is None:
+            offline = os.environ.get('MARKET_DATA_OFFLINE', '') not in ('', '0')
+        self.offline = offline
+
+    # ------ Storage layout ------
+    def _ticker_dir(self, ticker: str) -> str:
+        return os.path.join(self.cache_dir, ticker.replace('/', '_'))
+
+    def coverage(self, ticker: str) -> Optional[Tuple[dt.date, dt.date]]:
+        path = os.path.join(self._ticker_dir(ticker), 'meta.json')
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            meta = json.load(f)
+        return _to_date(meta['start']), _to_date(meta['end'])
+
+    def read(self, ticker: str) -> pd.DataFrame:
+        """Everything stored for a ticker (empty frame if nothing is cached)"""
+        folder = self._ticker_dir(ticker)
+        if not os.path.exists(os.path.join(folder, 'dates.npy')):
+            return pd.DataFrame(columns=FIELDS, index=pd.DatetimeIndex([], name='Date'), dtype=float)
+        dates = np.load(os.path.join(folder, 'dates.npy'), mmap_mode='r')
+        columns = {}
+        for field in FIELDS:
+            path = os.path.join(folder, f"{field.replace(' ', '_')}.npy")
+            columns[field] = np.load(path, mmap_mode='r') if os.path.exists(path) else np.full(len(dates), np.nan)
+        index = pd.DatetimeIndex(np.asarray(dates).astype('datetime64[ns]'), name='Date')
+        return pd.DataFrame({k: np.asarray(v) for k, v in columns.items()}, index=index)
+
+    def write(self, ticker: str, df: pd.DataFrame, start: dt.date, end: dt.date):
+        """Replace the stored bars of a ticker and record the covered range"""
+        folder = self._ticker_dir(ticker)
+        os.makedirs(folder, exist_ok=True)
+        df = df.reindex(columns=FIELDS).astype(float).sort_index()
+        arrays = {'dates': df.index.values.astype('datetime64[D]')}
+        for field in FIELDS:
+            arrays[field.replace(' ', '_')] = df[field].to_numpy()
+        for name, values in arrays.items():
+            tmp = os.path.join(folder, f"{name}.tmp.npy")
+            np.save(tmp, values)
+            os.replace(tmp, os.path.join(folder, f"{name}.npy"))
+        with open(os.path.join(folder, 'meta.json'), 'w') as f:
+            json.dump({'start': str(start), 'end': str(end)}, f)
+
+    # ------ Incremental refresh ------
+    def missing_ranges(self, ticker: str, start, end) -> List[Tuple[dt.date, dt.date]]:
+        """Date ranges of [start, end) not yet covered by the cache"""
+        start, end = _to_date(start), min(_to_date(end), dt.date.today())
+        covered = self.coverage(ticker)
+        if covered is None:
+            return [(start, end)] if start < end else []
+        ranges = []
+        if start < covered[0]:
+            ranges.append((start, covered[0]))
+        if end > covered[1]:
+            ranges.append((covered[1], end))
+        return ranges
+
+    def merge(self, ticker: str, new: pd.DataFrame, start: dt.date, end: dt.date):
+        """Append freshly fetched bars for [start, end) to the stored ones"""
+        old = self.read(ticker)
+        covered = self.coverage(ticker)
+        if not new.empty:
+            new = new.copy()
+            new.index = pd.DatetimeIndex(new.index).tz_localize(None).normalize()
+        combined = pd.concat([old, new.reindex(columns=FIELDS)]) if not old.empty else new.reindex(columns=FIELDS)
+        combined = combined[~combined.index.duplicated(keep='last')]
+        if covered is not None:
+            start, end = min(start, covered[0]), max(end, covered[1])
+        self.write(ticker, combined, start, end)
+
+    def refresh(self, tickers: List[str], start, end):
+        """Download and store the missing dates of every ticker"""
+        if self.offline:
+            return
+        pending = {}
+        for ticker in tickers:
+            for rng in self.missing_ranges(ticker, start, end):
+                pending.setdefault(rng, []).append(ticker)
+        # Tickers missing the same range are fetched together in one request
+        for (lo, hi), group in pending.items():
+            frames = self.source(group, lo, hi)
+            for ticker in group:
+                # Tickers the source could not deliver (missing or empty) stay uncovered and are retried next time
+                if ticker in frames and not frames[ticker].empty:
+                    self.merge(ticker, frames[ticker], lo, hi)
+
+    # ------ Queries ------
+    def history(self, ticker: str, start=None, end=None, period: Optional[str] = None) -> pd.DataFrame:
+        """OHLCV frame of one ticker over [start, end)"""
+        return self.history_many([ticker], start, end, period)[ticker]
+
+    def history_many(self, tickers: List[str], start=None, end=None,
+                     period: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        end = _to_date(end) if end is not None else dt.date.today() + dt.timedelta(days=1)
+        if start is None:
+            start = period_start(period or '1y', end)
+        start = _to_date(start)
+        self.refresh(tickers, start, end)
+        frames = {}
+        for ticker in tickers:
+            df = self.read(ticker)
+            frames[ticker] = df[(df.index >= pd.Timestamp(start)) & (df.index < pd.Timestamp(end))]
+        return frames
+
+    def prices(self, tickers: List[str], field: str = 'Adj Close', start=None, end=None,
+               period: Optional[str] = None) -> pd.DataFrame:
+        """Wide (dates x tickers) frame of one field, aligned on the union of dates.
+
+        Bars are stored unadjusted (OHLC as traded), so return-based analytics
+        should use the split/dividend adjusted 'Adj Close' field, the default.
+        """
+        frames = self.history_many(tickers, start, end, period)
+        return pd.DataFrame({ticker: df[field] for ticker, df in frames.items()})
+
+
+def load_history(ticker: str, start=None, end=None, period: Optional[str] = None,
+                 store: Optional[MarketDataStore] = None) -> pd.DataFrame:
+    store = store if store is not None else MarketDataStore()
+    return store.history(ticker, start, end, period)
+
+
+def load_prices(tickers: List[str], field: str = 'Adj Close', start=None, end=None,
+                period: Optional[str] = None, store: Optional[MarketDataStore] = None) -> pd.DataFrame:
+    store = store if store is not None else MarketDataStore()
+    return store.prices(tickers, field, start, end, period)
+
+
+def import_csv_directory(directory: str, tickers: List[str], store: Optional[MarketDataStore] = None):
+    """Load local CSV files into the store so that later runs work fully offline"""
+    store = store if store is not None else MarketDataStore()
+    for ticker, df in csv_source(directory)(tickers, dt.date(1970, 1, 1), dt.date.today() + dt.timedelta(days=1)).items():
+        if df.empty:
+            continue
+        store.merge(ticker, df, df.index[0].date(), df.index[-1].date() + dt.timedelta(days=1))
+
+
+def main():
+    # Example usage: the second request is served from disk, the third only fetches the extra month
+    tickers = ['AAPL', 'MSFT']
+    store = MarketDataStore()
+    end = dt.date.today()
+    for start in [end - dt.timedelta(days=365), end - dt.timedelta(days=365), end - dt.timedelta(days=395)]:
+        print(f"{start} -> {end}: missing {store.missing_ranges(tickers[0], start, end)}")
+        closes = store.prices(tickers, 'Adj Close', start, end)
+        print(closes.tail(3))
+
+
+if __name__ == "__main__":
+    main()
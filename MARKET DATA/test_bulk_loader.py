@@ -0,0 +1,120 @@
+import time
+import threading
+import datetime as dt
+import pandas as pd
+import pytest
+
+import bulk_loader
+from bulk_loader import BulkLoader, TokenBucket, stand_in_source
+from market_data import FIELDS, MarketDataStore
+
+START, END = dt.date(2024, 1, 1), dt.date(2024, 2, 1)
+TICKERS = [f"T{i:02d}" for i in range(10)]
+
+
+def recording_source(fail=lambda tickers, attempt: False):
+    """Stand-in source that records every request and fails whenever fail(tickers, attempt) is true"""
+    calls = []
+    lock = threading.Lock()
+
+    def source(tickers, start, end):
+        with lock:
+            attempt = sum(1 for c in calls if c == list(tickers))
+            calls.append(list(tickers))
+        if fail(tickers, attempt):
+            raise ConnectionError("simulated API failure")
+        dates = pd.bdate_range(start, end - dt.timedelta(days=1))
+        return {t: pd.DataFrame({field: 100.0 for field in FIELDS}, index=dates) for t in tickers}
+    source.calls = calls
+    return source
+
+
+def test_tickers_are_batched_per_request():
+    source = recording_source()
+    loader = BulkLoader(source, batch_size=3, max_workers=2, rate=1000.0, backoff=0.0)
+    frames = loader(TICKERS, START, END)
+    assert sorted(frames) == TICKERS
+    assert sorted(len(c) for c in source.calls) == [1, 3, 3, 3]
+    assert sorted(t for c in source.calls for t in c) == TICKERS
+    assert loader.errors == {}
+
+
+def test_token_bucket_paces_requests():
+    bucket = TokenBucket(rate=20.0, capacity=1)
+    start = time.perf_counter()
+    for _ in range(6):
+        bucket.acquire()
+    # The first token is available immediately, the next five arrive at 20 per second
+    assert time.perf_counter() - start >= 5 / 20 - 0.01
+
+
+def test_loader_requests_respect_rate_limit():
+    source = recording_source()
+    loader = BulkLoader(source, batch_size=2, max_workers=5, rate=10.0, burst=1, backoff=0.0)
+    start = time.perf_counter()
+    loader(TICKERS, START, END)
+    assert len(source.calls) == 5
+    assert time.perf_counter() - start >= 4 / 10 - 0.01
+
+
+def test_transient_failures_are_retried_with_exponential_backoff(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(bulk_loader.time, 'sleep', sleeps.append)
+    source = recording_source(fail=lambda tickers, attempt: attempt < 2)
+    loader = BulkLoader(source, batch_size=10, rate=1000.0, max_retries=3, backoff=0.5)
+    frames = loader(TICKERS, START, END)
+    assert sorted(frames) == TICKERS
+    assert len(source.calls) == 3
+    assert sleeps == [0.5, 1.0]
+    assert loader.errors == {}
+
+
+def test_bad_ticker_is_isolated_in_errors():
+    source = stand_in_source(latency=0.0, failure_rate=0.0, bad_tickers=('T04',))
+    loader = BulkLoader(source, batch_size=5, rate=1000.0, max_retries=1, backoff=0.0)
+    frames = loader(TICKERS, START, END)
+    assert sorted(frames) == [t for t in TICKERS if t != 'T04']
+    assert list(loader.errors) == ['T04']
+
+    # A later successful load clears the error
+    loader.source = stand_in_source(latency=0.0, failure_rate=0.0)
+    loader(['T04'], START, END)
+    assert loader.errors == {}
+
+
+def test_failing_batches_fall_back_to_single_tickers():
+    # Every multi-ticker request of the second batch fails, as does its unknown symbol
+    def fail(tickers, attempt):
+        return 'T07' in tickers or (len(tickers) > 1 and 'T05' in tickers)
+    source = recording_source(fail)
+    loader = BulkLoader(source, batch_size=5, rate=1000.0, max_retries=2, backoff=0.0)
+    frames = loader(TICKERS, START, END)
+    assert sorted(frames) == [t for t in TICKERS if t != 'T07']
+    assert set(loader.errors) == {'T07'}
+    assert source.calls.count(TICKERS[5:]) == 3
+    assert source.calls.count(['T07']) == 3
+    assert all(frames[t].index[0] == pd.Timestamp(START) for t in frames)
+
+
+def test_tickers_missing_from_a_response_are_reported():
+    def partial(tickers, start, end):
+        return {t: frame for t, frame in recording_source()(tickers, start, end).items() if t != 'T03'}
+    loader = BulkLoader(partial, batch_size=5, rate=1000.0, backoff=0.0)
+    frames = loader(TICKERS, START, END)
+    assert 'T03' not in frames and len(frames) == 9
+    assert loader.errors == {'T03': "no data returned"}
+
+
+def test_store_leaves_failed_tickers_uncovered(tmp_path):
+    source = stand_in_source(latency=0.0, failure_rate=0.0, bad_tickers=('T04',))
+    store = MarketDataStore(str(tmp_path), BulkLoader(source, batch_size=5, rate=1000.0, max_retries=0),
+                            offline=False)
+    frames = store.history_many(TICKERS, START, END)
+    assert frames['T04'].empty
+    assert store.coverage('T04') is None
+    assert store.coverage('T00') == (START, END)
+    assert store.missing_ranges('T04', START, END) == [(START, END)]
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
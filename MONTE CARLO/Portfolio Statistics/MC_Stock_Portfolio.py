@@ -2,8 +2,12 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import datetime as dt
-import yfinance as yf
 from typing import List, Tuple, Optional
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'MARKET DATA'))
+from market_data import load_prices
 
 def fetch_stock_data(stocks: List[str], 
                     start_date: Optional[dt.datetime] = None, 
@@ -14,8 +18,7 @@ def fetch_stock_data(stocks: List[str],
         start_date = end_date - dt.timedelta(days=365)
     
     try:
-        stockData = yf.download(stocks, start=start_date, end=end_date)
-        stockData = stockData['Close']
+        stockData = load_prices(stocks, 'Adj Close', start=start_date, end=end_date)
         returns = stockData.pct_change().dropna()
         
         meanReturns = returns.mean()
@@ -2,48 +2,30 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import datetime as dt
-import yfinance as yf
+from scipy.stats import norm
+import os
+import sys
 
-plt.ion()
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'MARKET DATA'))
+from market_data import load_prices
 
 def get_data(stocks, start, end):
-    stockData = yf.download(stocks, start=start, end=end) 
-    stockData = stockData['Close']  
+    stockData = load_prices(stocks, 'Adj Close', start=start, end=end)
     returns = stockData.pct_change()  
     meanReturns = returns.mean()  
     covMatrix = returns.cov()  
     return meanReturns, covMatrix
 
-stocks = ['AAPL', 'GOOGL', 'AMZN', 'MSFT']
-endDate = dt.datetime.now()
-startDate = endDate - dt.timedelta(days=365)
-mc_sims = 120  
-T = 252  
-initialPortfolioValue = 10000 
-meanReturns, covMatrix = get_data(stocks, startDate, endDate)     
-
-weights = np.random.dirichlet(np.ones(len(meanReturns)), size=1)[0]    
-
-meanM = np.full(shape=(T, len(weights)), fill_value=meanReturns.values)
-portfolio_sims = np.full(shape=(T, mc_sims), fill_value=initialPortfolioValue)
-
-# Ensure the covariance matrix is positive semi-definite for Cholesky decomposition
-try:
-    L = np.linalg.cholesky(covMatrix)   
-except np.linalg.LinAlgError:
-    eigvals, eigvecs = np.linalg.eigh(covMatrix)  
-    eigvals = np.maximum(eigvals, 0)  # Set negative eigenvalues to zero
-    covMatrix_fixed = eigvecs @ np.diag(eigvals) @ eigvecs.T  
-    L = np.linalg.cholesky(covMatrix_fixed)  
-
-# ------ Monte Carlo simulation of portfolio growth ------
-for m in range(mc_sims):
-    Z = np.random.normal(size=(T, len(weights)))    
-    dailyReturns = meanM + np.dot(Z, L.T)  # Corrected this line
-    portfolio_returns = np.dot(weights, dailyReturns.T)  # Portfolio returns for each day
-    # Calculate cumulative product of returns
-    for t in range(1, T):
-        portfolio_sims[t, m] = portfolio_sims[t-1, m] * (1 + portfolio_returns[t])
+def cholesky_factor(covMatrix):
+    # Ensure the covariance matrix is positive semi-definite for Cholesky decomposition
+    try:
+        L = np.linalg.cholesky(covMatrix)   
+    except np.linalg.LinAlgError:
+        eigvals, eigvecs = np.linalg.eigh(covMatrix)  
+        eigvals = np.maximum(eigvals, 1e-10 * eigvals.max())  # Floor negative/zero eigenvalues just above zero
+        covMatrix_fixed = eigvecs @ np.diag(eigvals) @ eigvecs.T  
+        L = np.linalg.cholesky(covMatrix_fixed)  
+    return L
 
 def VaR(returns, alpha=5):
     if isinstance(returns, pd.Series):
@@ -58,53 +40,158 @@ def CVaR(returns, alpha=5):
     else:
         raise TypeError("Expected pandas series")
 
-# ------ Convert portfolio values into percentage returns ------
-portfolioReturns = (portfolio_sims[-1, :] - initialPortfolioValue) / initialPortfolioValue  
-VaR_percent = VaR(pd.Series(portfolioReturns), alpha=5)   
-CVaR_percent = CVaR(pd.Series(portfolioReturns), alpha=5)  
-VaR_dollar = VaR_percent * initialPortfolioValue   
-CVaR_dollar = CVaR_percent * initialPortfolioValue  
-
-# ------ Compute VaR & CVaR in absolute portfolio value ------
-VaR_value = VaR(pd.Series(portfolio_sims[-1, :]), alpha=5)  # 5% percentile portfolio value
-CVaR_value = CVaR(pd.Series(portfolio_sims[-1, :]), alpha=5)  # Average worst 5% portfolio value
-print(f'Value at Risk (VaR) at 95% confidence level: ${round(VaR_dollar, 2)}')
-print(f'Conditional Value at Risk (CVaR) at 95% confidence level: ${round(CVaR_dollar, 2)}')
-
-plt.figure(figsize=(13, 6))
-
-# ------ Histogram of Portfolio Returns with VaR & CVaR ------
-plt.subplot(1, 2, 1)
-plt.hist(portfolioReturns, bins=50, color="blue", alpha=0.6, label="Simulated Returns")
-plt.axvline(VaR_percent, color='red', linestyle='dashed', linewidth=2, label=f"VaR 95%: {VaR_percent:.2%}")
-plt.axvline(CVaR_percent, color='green', linestyle='dashed', linewidth=2, label=f"CVaR 95%: {CVaR_percent:.2%}")
-plt.xlabel("Portfolio Return (%)")
-plt.ylabel("Frequency")
-plt.title("Portfolio Return Distribution")
-plt.legend(prop={'size': 10})
-
-# ------ Histogram of Portfolio Value with VaR & CVaR ------
-plt.subplot(1, 2, 2)
-plt.hist(portfolio_sims[-1, :], bins=50, color="purple", alpha=0.6, label="Simulated Portfolio Value")
-plt.axvline(VaR_value, color='red', linestyle='dashed', linewidth=2, label=f"VaR 95%: ${VaR_value:,.2f}")
-plt.axvline(CVaR_value, color='green', linestyle='dashed', linewidth=2, label=f"CVaR 95%: ${CVaR_value:,.2f}")
-plt.xlabel("Portfolio Value ($)")
-plt.ylabel("Frequency")
-plt.title("Portfolio Value Distribution")
-plt.legend(prop={'size': 10})
-
-plt.tight_layout()
-
-# ------ Monte Carlo Simulations of Portfolio Value with VaR & CVaR ------
-plt.figure(figsize=(14, 8))
-for i in range(mc_sims):
-    plt.plot(portfolio_sims[:, i], alpha=0.3)  # Each simulation path
-plt.axhline(VaR_value, color='red', linestyle='dashed', linewidth=2, label=f"VaR 95%: ${VaR_value:,.2f}")
-plt.axhline(CVaR_value, color='green', linestyle='dashed', linewidth=2, label=f"CVaR 95%: ${CVaR_value:,.2f}")
-plt.axhline(initialPortfolioValue, color='black', linestyle='dashed', linewidth=2, label="Initial Value")
-plt.xlabel("Days")
-plt.ylabel("Portfolio Value ($)")
-plt.title("Monte Carlo Simulation of Portfolio Growth")
-plt.legend(prop={'size': 10})
-
-plt.show(block=True)
+# ------ Importance sampling of the loss tail ------
+def loss_direction_shift(L, weights, T, alpha=0.1):
+    """Daily mean shift of the standard normal factors that centres the
+    (linearised) T-day portfolio return on its alpha% quantile."""
+    a = L.T @ weights                      # sensitivity of the portfolio return to each factor
+    sigma_p = np.linalg.norm(a)
+    return norm.ppf(alpha / 100) / np.sqrt(T) * a / sigma_p
+
+def simulate_terminal_returns(meanReturns, L, weights, T, n_paths, shift=None, rng=None):
+    """Terminal portfolio returns and likelihood ratios dP/dQ of each path.
+
+    With shift=None the factors are drawn from N(0, I) and every likelihood
+    ratio is one (plain Monte Carlo)."""
+    rng = np.random.default_rng() if rng is None else rng
+    mu = np.asarray(meanReturns, dtype=float)
+    shift = np.zeros(len(weights)) if shift is None else shift
+    growth = np.ones(n_paths)
+    log_lr = np.zeros(n_paths)
+    for t in range(T):
+        Z = rng.standard_normal((n_paths, len(weights))) + shift
+        growth *= 1 + (mu + Z @ L.T) @ weights
+        log_lr += -Z @ shift + 0.5 * shift @ shift
+    return growth - 1, np.exp(log_lr)
+
+def weighted_VaR_CVaR(returns, lr, alpha=5):
+    """VaR and CVaR (alpha in %) of returns sampled under Q with likelihood ratios lr."""
+    order = np.argsort(returns)
+    r_sorted, w_sorted = returns[order], lr[order]
+    cdf = np.cumsum(w_sorted) / len(returns)
+    k = min(np.searchsorted(cdf, alpha / 100), len(returns) - 1)
+    tail_w = w_sorted[:k + 1]
+    return r_sorted[k], np.sum(tail_w * r_sorted[:k + 1]) / np.sum(tail_w)
+
+def importance_sampling_VaR_CVaR(meanReturns, covMatrix, weights, T=252, n_paths=20000, alpha=0.1, seed=None):
+    """Compare plain and importance-sampled tail estimates at equal path count."""
+    rng = np.random.default_rng(seed)
+    L = cholesky_factor(covMatrix)
+    shift = loss_direction_shift(L, weights, T, alpha)
+
+    plain_returns, plain_lr = simulate_terminal_returns(meanReturns, L, weights, T, n_paths, rng=rng)
+    is_returns, is_lr = simulate_terminal_returns(meanReturns, L, weights, T, n_paths, shift=shift, rng=rng)
+    VaR_plain, CVaR_plain = weighted_VaR_CVaR(plain_returns, plain_lr, alpha)
+    VaR_is, CVaR_is = weighted_VaR_CVaR(is_returns, is_lr, alpha)
+
+    # Variance of the tail-probability estimator P(R <= VaR) under both schemes
+    tail = is_returns <= VaR_is
+    p_is = np.mean(is_lr * tail)
+    var_is = np.var(is_lr * tail) / n_paths
+    var_plain = p_is * (1 - p_is) / n_paths
+    tail_lr = is_lr[tail]
+
+    return {
+        'VaR_plain': VaR_plain,
+        'CVaR_plain': CVaR_plain,
+        'VaR_IS': VaR_is,
+        'CVaR_IS': CVaR_is,
+        'tail_paths_plain': int(np.sum(plain_returns <= VaR_plain)),
+        'tail_paths_IS': int(np.sum(tail)),
+        'ESS': np.sum(is_lr) ** 2 / np.sum(is_lr ** 2),
+        'ESS_tail': np.sum(tail_lr) ** 2 / np.sum(tail_lr ** 2),
+        'variance_reduction': var_plain / var_is
+    }
+
+def main():
+    plt.ion()
+
+    stocks = ['AAPL', 'GOOGL', 'AMZN', 'MSFT']
+    endDate = dt.datetime.now()
+    startDate = endDate - dt.timedelta(days=365)
+    mc_sims = 120  
+    T = 252  
+    initialPortfolioValue = 10000 
+    meanReturns, covMatrix = get_data(stocks, startDate, endDate)     
+
+    weights = np.random.dirichlet(np.ones(len(meanReturns)), size=1)[0]    
+
+    meanM = np.full(shape=(T, len(weights)), fill_value=meanReturns.values)
+    portfolio_sims = np.full(shape=(T, mc_sims), fill_value=initialPortfolioValue)
+
+    L = cholesky_factor(covMatrix)
+
+    # ------ Monte Carlo simulation of portfolio growth ------
+    for m in range(mc_sims):
+        Z = np.random.normal(size=(T, len(weights)))    
+        dailyReturns = meanM + np.dot(Z, L.T)  # Corrected this line
+        portfolio_returns = np.dot(weights, dailyReturns.T)  # Portfolio returns for each day
+        # Calculate cumulative product of returns
+        for t in range(1, T):
+            portfolio_sims[t, m] = portfolio_sims[t-1, m] * (1 + portfolio_returns[t])
+
+    # ------ Convert portfolio values into percentage returns ------
+    portfolioReturns = (portfolio_sims[-1, :] - initialPortfolioValue) / initialPortfolioValue  
+    VaR_percent = VaR(pd.Series(portfolioReturns), alpha=5)   
+    CVaR_percent = CVaR(pd.Series(portfolioReturns), alpha=5)  
+    VaR_dollar = VaR_percent * initialPortfolioValue   
+    CVaR_dollar = CVaR_percent * initialPortfolioValue  
+
+    # ------ Compute VaR & CVaR in absolute portfolio value ------
+    VaR_value = VaR(pd.Series(portfolio_sims[-1, :]), alpha=5)  # 5% percentile portfolio value
+    CVaR_value = CVaR(pd.Series(portfolio_sims[-1, :]), alpha=5)  # Average worst 5% portfolio value
+    print(f'Value at Risk (VaR) at 95% confidence level: ${round(VaR_dollar, 2)}')
+    print(f'Conditional Value at Risk (CVaR) at 95% confidence level: ${round(CVaR_dollar, 2)}')
+
+    # ------ Importance-sampled VaR & CVaR at 99.9% confidence ------
+    is_results = importance_sampling_VaR_CVaR(meanReturns, covMatrix, weights, T=T, n_paths=20000, alpha=0.1)
+    print(f"\nTail estimates at 99.9% confidence (20,000 paths each):")
+    print(f"Plain MC:            VaR ${is_results['VaR_plain'] * initialPortfolioValue:,.2f}, "
+          f"CVaR ${is_results['CVaR_plain'] * initialPortfolioValue:,.2f} "
+          f"({is_results['tail_paths_plain']} tail paths)")
+    print(f"Importance sampling: VaR ${is_results['VaR_IS'] * initialPortfolioValue:,.2f}, "
+          f"CVaR ${is_results['CVaR_IS'] * initialPortfolioValue:,.2f} "
+          f"({is_results['tail_paths_IS']} tail paths)")
+    print(f"Effective sample size: {is_results['ESS']:,.0f} overall, {is_results['ESS_tail']:,.0f} in the tail")
+    print(f"Variance reduction vs plain MC: {is_results['variance_reduction']:.1f}x")
+
+    plt.figure(figsize=(13, 6))
+
+    # ------ Histogram of Portfolio Returns with VaR & CVaR ------
+    plt.subplot(1, 2, 1)
+    plt.hist(portfolioReturns, bins=50, color="blue", alpha=0.6, label="Simulated Returns")
+    plt.axvline(VaR_percent, color='red', linestyle='dashed', linewidth=2, label=f"VaR 95%: {VaR_percent:.2%}")
+    plt.axvline(CVaR_percent, color='green', linestyle='dashed', linewidth=2, label=f"CVaR 95%: {CVaR_percent:.2%}")
+    plt.xlabel("Portfolio Return (%)")
+    plt.ylabel("Frequency")
+    plt.title("Portfolio Return Distribution")
+    plt.legend(prop={'size': 10})
+
+    # ------ Histogram of Portfolio Value with VaR & CVaR ------
+    plt.subplot(1, 2, 2)
+    plt.hist(portfolio_sims[-1, :], bins=50, color="purple", alpha=0.6, label="Simulated Portfolio Value")
+    plt.axvline(VaR_value, color='red', linestyle='dashed', linewidth=2, label=f"VaR 95%: ${VaR_value:,.2f}")
+    plt.axvline(CVaR_value, color='green', linestyle='dashed', linewidth=2, label=f"CVaR 95%: ${CVaR_value:,.2f}")
+    plt.xlabel("Portfolio Value ($)")
+    plt.ylabel("Frequency")
+    plt.title("Portfolio Value Distribution")
+    plt.legend(prop={'size': 10})
+
+    plt.tight_layout()
+
+    # ------ Monte Carlo Simulations of Portfolio Value with VaR & CVaR ------
+    plt.figure(figsize=(14, 8))
+    for i in range(mc_sims):
+        plt.plot(portfolio_sims[:, i], alpha=0.3)  # Each simulation path
+    plt.axhline(VaR_value, color='red', linestyle='dashed', linewidth=2, label=f"VaR 95%: ${VaR_value:,.2f}")
+    plt.axhline(CVaR_value, color='green', linestyle='dashed', linewidth=2, label=f"CVaR 95%: ${CVaR_value:,.2f}")
+    plt.axhline(initialPortfolioValue, color='black', linestyle='dashed', linewidth=2, label="Initial Value")
+    plt.xlabel("Days")
+    plt.ylabel("Portfolio Value ($)")
+    plt.title("Monte Carlo Simulation of Portfolio Growth")
+    plt.legend(prop={'size': 10})
+
+    plt.show(block=True)
+
+if __name__ == "__main__":
+    main()
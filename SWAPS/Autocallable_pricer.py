@@ -0,0 +1,130 @@
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'EXOTIC OPTIONS', 'Barrier_option'))
+from MC_w_barrier_activation import barrier_hit_probability
+
+KI_MONITORING = ('maturity', 'observation', 'continuous')
+
+
+def price_autocallable(S0, r, sigma, observation_times, autocall_levels, coupons, coupon_barrier=None,
+                       ki_barrier=0.6, ki_monitoring='maturity', memory=True, q=0.0, notional=1.0,
+                       n_paths=1_000_000, seed=None):
+    """Monte Carlo price of an autocallable note under Black-Scholes, simulated at observation dates only.
+
+    On observation date i (times in years, the last one is maturity) the note
+    is called if S_i >= autocall_levels[i] * S0: it repays the notional and
+    retires. A coupon coupons[i] is paid when S_i >= coupon_barrier[i] * S0
+    (the autocall level by default, i.e. coupons only on redemption); with
+    `memory`, coupons missed earlier are paid too. At maturity an uncalled note
+    repays S_T / S0 if the knock-in barrier was breached and S_T < S0, else
+    the notional. The barrier is checked at maturity only, on every
+    observation date, or continuously (Brownian-bridge crossing probability
+    between dates).
+
+    Spots are drawn exactly from one date to the next for the live paths only:
+    called paths are dropped from the active arrays, so later dates cost less.
+    Returns a dict with price, std_error, autocall_probability (per date, the
+    last entry being a call at maturity), knock_in_probability (reaching
+    maturity knocked in), loss_probability, expected_life (years) and seconds.
+    """
+    if ki_monitoring not in KI_MONITORING:
+        raise ValueError(f"ki_monitoring must be one of {KI_MONITORING}")
+    start = time.perf_counter()
+    times = np.asarray(observation_times, dtype=float)
+    n_dates = len(times)
+    autocall_levels = np.broadcast_to(np.asarray(autocall_levels, dtype=float), (n_dates,))
+    coupons = np.broadcast_to(np.asarray(coupons, dtype=float), (n_dates,))
+    coupon_barrier = autocall_levels if coupon_barrier is None else \
+        np.broadcast_to(np.asarray(coupon_barrier, dtype=float), (n_dates,))
+    steps = np.diff(times, prepend=0.0)
+    discounts = np.exp(-r * times)
+    rng = np.random.default_rng(seed)
+
+    pv = np.zeros(n_paths)
+    called_count = np.zeros(n_dates)
+    alive = np.arange(n_paths)
+    S = np.full(n_paths, float(S0))
+    knocked_in = np.zeros(n_paths, dtype=bool)
+    unpaid = np.zeros(n_paths)
+    ki_level = ki_barrier * S0
+
+    for i in range(n_dates):
+        dt = steps[i]
+        S_prev = S
+        S = S_prev * np.exp((r - q - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * rng.standard_normal(len(S)))
+        if ki_monitoring == 'continuous':
+            hit = barrier_hit_probability(np.column_stack([S_prev, S]), ki_level, sigma, dt)
+            knocked_in |= rng.random(len(S)) < hit
+        elif ki_monitoring == 'observation':
+            knocked_in |= S <= ki_level
+
+        unpaid += coupons[i]
+        coupon_paid = S >= coupon_barrier[i] * S0
+        if coupon_barrier[i] < autocall_levels[i] or i == n_dates - 1:
+            pv[alive[coupon_paid]] += discounts[i] * unpaid[coupon_paid]
+            unpaid[coupon_paid] = 0.0
+
+        called = S >= autocall_levels[i] * S0
+        called_count[i] = np.count_nonzero(called)
+        if i == n_dates - 1:
+            if ki_monitoring == 'maturity':
+                knocked_in = S <= ki_level
+            loss = knocked_in & (S < S0)
+            pv[alive] += discounts[i] * np.where(loss, S / S0, 1.0)
+            break
+
+        # Called notes repay (their coupon is paid above if coupon_barrier < autocall level)
+        if coupon_barrier[i] >= autocall_levels[i]:
+            redeemed = called & coupon_paid
+            pv[alive[redeemed]] += discounts[i] * unpaid[redeemed]
+            unpaid[redeemed] = 0.0
+        pv[alive[called]] += discounts[i]
+        survivors = ~called
+        alive, S, knocked_in, unpaid = alive[survivors], S[survivors], knocked_in[survivors], unpaid[survivors]
+        if not memory:
+            unpaid[:] = 0.0
+
+    autocall_probability = called_count / n_paths
+    early = autocall_probability[:-1]
+    values = notional * pv
+    return {
+        'price': values.mean(),
+        'std_error': values.std(ddof=1) / np.sqrt(n_paths),
+        'autocall_probability': autocall_probability,
+        'knock_in_probability': np.count_nonzero(knocked_in) / n_paths,
+        'loss_probability': np.count_nonzero(loss) / n_paths,
+        'expected_life': np.sum(early * times[:-1]) + (1 - early.sum()) * times[-1],
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def main():
+    # Example usage: the 4-year step-down autocallable of Structured_payoff_diagram.py (snowball coupons)
+    S0, r, sigma = 100, 0.03, 0.25
+    times = [1, 2, 3, 4]
+    triggers = [1.0, 0.95, 0.9, 0.85]
+    snowball = [0.035, 0.07, 0.105, 0.14]
+    for ki_monitoring in KI_MONITORING:
+        result = price_autocallable(S0, r, sigma, times, triggers, snowball, memory=False, ki_monitoring=ki_monitoring,
+                                    seed=0)
+        probs = ", ".join(f"{p:.1%}" for p in result['autocall_probability'])
+        print(f"Snowball, knock-in at {ki_monitoring:<12}: price {result['price']:.4f} ± {result['std_error']:.4f}, "
+              f"autocall by date [{probs}], P(KI) {result['knock_in_probability']:.1%}, "
+              f"expected life {result['expected_life']:.2f}y ({result['seconds']:.2f}s)")
+
+    # Quarterly phoenix: 2% coupon above 70%, autocall at 100%, continuously monitored 60% knock-in
+    quarters = np.arange(1, 13) / 4
+    for memory in (True, False):
+        result = price_autocallable(S0, r, sigma, quarters, 1.0, 0.02, coupon_barrier=0.7, ki_monitoring='continuous',
+                                    memory=memory, seed=1)
+        print(f"\nPhoenix, memory={memory}: price {result['price']:.4f} ± {result['std_error']:.4f}, "
+              f"P(loss) {result['loss_probability']:.1%}, expected life {result['expected_life']:.2f}y "
+              f"({result['seconds']:.2f}s for 1,000,000 paths x {len(quarters)} dates)")
+        print("  autocall probability per quarter: " + " ".join(f"{p:.3f}" for p in result['autocall_probability']))
+
+
+if __name__ == "__main__":
+    main()
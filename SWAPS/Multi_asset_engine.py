@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'MONTE CARLO', 'Portfolio Statistics'))
+from MC_VaR_CVaR import cholesky_factor
+from Payoff_compiler import compile_payoff
+
+REDUCERS = ('worst_of', 'best_of', 'basket')
+
+
+def correlation_factor(corr):
+    """Cholesky factor of a correlation matrix, eigen-repaired if needed and rescaled to unit diagonal"""
+    L = cholesky_factor(np.asarray(corr, dtype=float))
+    return L / np.linalg.norm(L, axis=1, keepdims=True)
+
+
+def simulate_multi_asset(r, sigma, corr, observation_times, n_paths=100_000, q=0.0, weights=None,
+                         reducers=REDUCERS, chunk_size=20_000, seed=None):
+    """Correlated Black-Scholes performances S_i(t) / S_i(0), reduced across assets at every observation date.
+
+    Each chunk draws a (paths x dates x assets) block of normals, correlates it
+    with the Cholesky factor of `corr` (repaired if it is not positive
+    definite), and reduces the asset axis straight away: worst_of = min_i,
+    best_of = max_i, basket = sum_i weights_i perf_i (equal weights by default).
+    Only the reduced (paths x dates + 1) arrays are kept, with column 0 equal
+    to 1, so they plug directly into compiled payoffs as normalised fixings.
+    """
+    unknown = set(reducers) - set(REDUCERS)
+    if unknown:
+        raise ValueError(f"unknown reducers {sorted(unknown)}; choose from {REDUCERS}")
+    sigma = np.atleast_1d(np.asarray(sigma, dtype=float))
+    n_assets = len(sigma)
+    q = np.broadcast_to(np.asarray(q, dtype=float), (n_assets,))
+    weights = np.full(n_assets, 1 / n_assets) if weights is None else np.asarray(weights, dtype=float)
+    times = np.asarray(observation_times, dtype=float)
+    dt = np.diff(times, prepend=0.0)[:, None]
+    drift = (r - q - 0.5 * sigma ** 2) * dt
+    vol = (sigma * np.sqrt(dt))[None, :, :]
+    factor_T = correlation_factor(corr).T
+    rng = np.random.default_rng(seed)
+
+    out = {name: np.empty((n_paths, len(times) + 1)) for name in reducers}
+    for array in out.values():
+        array[:, 0] = 1.0
+    for start in range(0, n_paths, chunk_size):
+        m = min(chunk_size, n_paths - start)
+        z = rng.standard_normal((m, len(times), n_assets)) @ factor_T
+        z *= vol
+        z += drift
+        np.cumsum(z, axis=1, out=z)
+        performance = np.exp(z, out=z)
+        rows = slice(start, start + m)
+        if 'worst_of' in out:
+            out['worst_of'][rows, 1:] = performance.min(axis=2)
+        if 'best_of' in out:
+            out['best_of'][rows, 1:] = performance.max(axis=2)
+        if 'basket' in out:
+            out['basket'][rows, 1:] = performance @ weights
+    return out
+
+
+def main():
+    # Example usage: 3 equity underlyings, monthly fixings over 2 years, 500k paths
+    r = 0.03
+    sigma = [0.25, 0.30, 0.20]
+    corr = [[1.0, 0.6, 0.5],
+            [0.6, 1.0, 0.4],
+            [0.5, 0.4, 1.0]]
+    months = np.arange(1, 25) / 12
+    T = months[-1]
+    start = time.perf_counter()
+    reduced = simulate_multi_asset(r, sigma, corr, months, n_paths=500_000, seed=0)
+    print(f"500,000 paths x {len(months)} dates x {len(sigma)} assets reduced in {time.perf_counter() - start:.2f}s")
+
+    discount = np.exp(-r * T)
+    for name, expression, params in [
+            ('basket', "max(S[-1] - strike, 0)", dict(strike=1.0)),
+            ('best_of', "max(S[-1] - strike, 0)", dict(strike=1.0)),
+            ('worst_of', "max(strike - S[-1], 0)", dict(strike=1.0)),
+            ('worst_of', "(min(S[-1], 1) if min(S[1:]) <= barrier else 1) + coupon", dict(barrier=0.6, coupon=0.16))]:
+        values = discount * compile_payoff(expression)(reduced[name], **params)
+        print(f"{name:<9} {expression:<60} {values.mean():.4f} ± {values.std(ddof=1) / np.sqrt(len(values)):.4f}")
+
+    # Checks: a one-asset basket is Black-Scholes; perfectly correlated equal-vol assets make worst-of = best-of
+    from scipy.stats import norm
+    single = simulate_multi_asset(r, 0.25, [[1.0]], [T], n_paths=500_000, reducers=('basket',), seed=0)['basket']
+    d1 = (r + 0.5 * 0.25 ** 2) * T / (0.25 * np.sqrt(T))
+    bs = norm.cdf(d1) - np.exp(-r * T) * norm.cdf(d1 - 0.25 * np.sqrt(T))
+    call = discount * np.maximum(single[:, -1] - 1, 0)
+    print(f"\nOne-asset ATM call: MC {call.mean():.4f} ± {call.std(ddof=1) / np.sqrt(len(call)):.4f}, "
+          f"Black-Scholes {bs:.4f}")
+    locked = simulate_multi_asset(r, [0.2, 0.2], [[1.0, 1.0], [1.0, 1.0]], months, n_paths=10_000, seed=2)
+    print(f"Singular correlation (repaired): max |worst-of - best-of| = "
+          f"{np.max(np.abs(locked['worst_of'] - locked['best_of'])):.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ def reverse_convertible_payoff(spot_prices, initial_price, coupon, barrier):
     return payoffs
 
 def autocallable_payoff(spot_prices, initial_price, coupons, trigger_levels, observation_periods, final_barrier):
+    # Terminal-spot picture only; Autocallable_pricer.py prices the full observation schedule
     final_period_coupon = coupons[-1]
     final_trigger = trigger_levels[-1]
     max_coupon = sum(coupons)  
@@ -190,4 +191,5 @@ def plot_structured_products():
     plt.subplots_adjust(bottom=0.2, hspace=0.6, top=0.9)
     plt.show()
 
-plot_structured_products()
+if __name__ == "__main__":
+    plot_structured_products()
@@ -1,58 +1,53 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.stats import norm
 
-def black_scholes_vega(S, K, T, r, sigma, barrier=None, option_type='call'):
-    d1 = (np.log(S / K) + (r + 0.5 * sigma**2)) * T
-    d1 /= (sigma * np.sqrt(T))
-    
-    vega = S * np.sqrt(T) * norm.pdf(d1)
-    
-    # Simple barrier effect approximation - vega increases near barrier
-    if barrier is not None:
-        distance_to_barrier = np.abs(S - barrier) / barrier
-        barrier_effect = 0.2 / (distance_to_barrier + 0.05)  # Scaling factor
-        vega *= (1 + barrier_effect)
-    return vega
-
-def black_scholes_gamma(S, K, T, r, sigma, barrier=None, option_type='call'):
-    d1 = (np.log(S / K) + (r + 0.5 * sigma**2)) * T
-    d1 /= (sigma * np.sqrt(T))
-    
-    gamma = norm.pdf(d1) / (S * sigma * np.sqrt(T))
-    
-    # Simple barrier effect approximation
-    if barrier is not None:
-        distance_to_barrier = np.abs(S - barrier) / barrier
-        barrier_effect = 0.1 / (distance_to_barrier + 0.05)  # Smaller effect than vega
-        gamma *= (1 + barrier_effect)
-    return gamma
-
-K = 100  
-barrier = 110  
-T = 0.5  
-r = 0.03  
-sigma = 0.2  
-
-S = np.linspace(70, 130, 500)
-
-vegas = [black_scholes_vega(s, K, T, r, sigma, barrier) for s in S]
-gammas = [black_scholes_gamma(s, K, T, r, sigma, barrier) for s in S]
-
-vegas = vegas / np.max(vegas)
-gammas = gammas / np.max(gammas)
-
-plt.figure(figsize=(10, 6))
-plt.plot(S, vegas, label='Vega Exposure', color='blue', linewidth=2)
-plt.plot(S, gammas, label='Gamma Exposure', color='green', linestyle='--', linewidth=2)
-plt.axvline(x=barrier, color='red', linestyle=':', label='Barrier Level')
-
-plt.axvspan(barrier-5, barrier+5, color='red', alpha=0.1, label='Barrier Zone')
-
-plt.title('Vega and Gamma Exposure Near a Barrier', fontsize=14)
-plt.xlabel('Underlying Price', fontsize=12)
-plt.ylabel('Normalized Exposure', fontsize=12)
-plt.legend(fontsize=10)
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.show()
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'EXOTIC OPTIONS', 'Barrier_option'))
+from Barrier_analytic import barrier_greeks
+
+def black_scholes_vega(S, K, T, r, sigma):
+    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
+    return S * np.sqrt(T) * norm.pdf(d1)
+
+def black_scholes_gamma(S, K, T, r, sigma):
+    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
+    return norm.pdf(d1) / (S * sigma * np.sqrt(T))
+
+def main():
+    K = 100  
+    barrier = 110  
+    T = 0.5  
+    r = 0.03  
+    sigma = 0.2  
+
+    S = np.linspace(70, 130, 500)
+
+    # Up-and-out call (exact Reiner-Rubinstein Greeks): vega and gamma are negative over most of the range
+    # up to the barrier and zero beyond it, unlike the vanilla call's
+    greeks = barrier_greeks(S, K, barrier, r, sigma, T, 'up_and_out', 'call')
+    vegas = greeks['vega'] / np.max(np.abs(greeks['vega']))
+    gammas = greeks['gamma'] / np.max(np.abs(greeks['gamma']))
+    vanilla_vegas = black_scholes_vega(S, K, T, r, sigma)
+    vanilla_vegas = vanilla_vegas / np.max(np.abs(vanilla_vegas))
+
+    plt.figure(figsize=(10, 6))
+    plt.plot(S, vegas, label='Vega Exposure', color='blue', linewidth=2)
+    plt.plot(S, gammas, label='Gamma Exposure', color='green', linestyle='--', linewidth=2)
+    plt.plot(S, vanilla_vegas, label='Vanilla Call Vega (no barrier)', color='gray', linestyle=':', linewidth=1.5)
+    plt.axvline(x=barrier, color='red', linestyle=':', label='Barrier Level')
+
+    plt.axvspan(barrier-5, barrier+5, color='red', alpha=0.1, label='Barrier Zone')
+
+    plt.title('Vega and Gamma Exposure Near a Barrier', fontsize=14)
+    plt.xlabel('Underlying Price', fontsize=12)
+    plt.ylabel('Normalized Exposure', fontsize=12)
+    plt.legend(fontsize=10)
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,21 @@
 import numpy as np
 import pandas as pd
-import yfinance as yf
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from arch import arch_model
 from scipy import stats
 import seaborn as sns
 from sklearn.metrics import mean_squared_error, mean_absolute_error
-import time
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'MARKET DATA'))
+from market_data import load_history
 
 # Set random seed for reproducibility
 np.random.seed(42)
 
 def get_sp500_data(start_date, end_date):
-    data = yf.download('^GSPC', start=start_date, end=end_date)
+    data = load_history('^GSPC', start=start_date, end=end_date)
     
     print("Columns in DataFrame:", data.columns)
     print("Column types:", type(data.columns))
@@ -40,26 +42,6 @@ def calc_realized_volatility(returns, window=21):
     """Calculate realized volatility as rolling standard deviation of returns"""
     return returns.rolling(window=window).std() * np.sqrt(252)
 
-def fit_garch_model(returns, p=1, q=1, forecast_horizon=1):
-    returns = returns.dropna()
-    
-    model = arch_model(returns, vol='Garch', p=p, q=q, rescale=False)
-    model_fit = model.fit(disp='off')
-    
-    conditional_vol = pd.Series(
-        model_fit.conditional_volatility * np.sqrt(252),
-        index=returns.index
-    )
-    
-    # Generate out-of-sample forecasts
-    forecasts = model_fit.forecast(horizon=forecast_horizon)
-    forecast_vol = pd.Series(
-        np.sqrt(forecasts.variance.iloc[-1].values) * np.sqrt(252),
-        index=pd.date_range(start=returns.index[-1], periods=forecast_horizon+1)[1:]
-    )
-    
-    return model_fit, conditional_vol, forecast_vol
-
 def evaluate_forecasts(realized, forecasted):
     """Evaluate the forecasts against realized values"""
     # Align data
@@ -90,6 +72,9 @@ periods = {
 }
 
 def analyze_period(period_name, start_date, end_date):
+    # GARCH_study_runner imports this module, so its fit cache is imported lazily
+    from GARCH_study_runner import ModelSpec, fit_cached
+
     print(f"\nAnalyzing {period_name} period from {start_date} to {end_date}")
     
     data = get_sp500_data(start_date, end_date)
@@ -97,13 +82,17 @@ def analyze_period(period_name, start_date, end_date):
     
     realized_vol = calc_realized_volatility(returns)
     
-    model_fit, cond_vol, _ = fit_garch_model(returns)
+    # Served from the cache filled by run_study
+    model_fit, _ = fit_cached(returns, ModelSpec('GARCH', p=1, q=1))
+    cond_vol = model_fit['conditional_volatility'] * np.sqrt(252)
     
     eval_results = evaluate_forecasts(realized_vol, cond_vol)
     
     print("\nGARCH Model Summary:")
-    print(model_fit.summary().tables[0].as_text())
-    print(model_fit.summary().tables[1].as_text())
+    print(f"Observations: {len(returns)}, Log-likelihood: {model_fit['loglikelihood']:.2f}, "
+          f"AIC: {model_fit['aic']:.2f}, BIC: {model_fit['bic']:.2f}")
+    print(pd.DataFrame({'coef': model_fit['params'], 'std err': model_fit['std_err'],
+                        't': model_fit['tvalues'], 'P>|t|': model_fit['pvalues']}).round(4))
     print("\nForecast Evaluation Metrics:")
     for metric, value in eval_results.items():
         print(f"{metric}: {value:.4f}")
@@ -144,152 +133,159 @@ def analyze_period(period_name, start_date, end_date):
         'model': model_fit
     }
 
-# Run for each period
-results = {}
-for period_name, (start_date, end_date) in periods.items():
-    try:
-        results[period_name] = analyze_period(period_name, start_date, end_date)
-        time.sleep(10)  # To avoid hitting API limits
-    except Exception as e:
-        print(f"Error analyzing {period_name} period: {e}")
-
-# Run comparative analysis if results for at least one period
-if results:
-    def compare_periods():
-        # Get only the periods that were successfully analyzed
-        available_periods = list(results.keys())
-        
-        if len(available_periods) < 2:
-            print("\nNot enough periods successfully analyzed for comparison")
-            return None
-        
-        metrics_df = pd.DataFrame({
-            period: results[period]['eval_results'] 
-            for period in available_periods
-        }).T
-        
-        print("\nComparative Analysis Across Periods:")
-        print(metrics_df)
-        
-        plt.figure(figsize=(14, 12))
-        
-        plt.subplot(2, 2, 1)
-        metrics_df['RMSE'].plot(kind='bar')
-        plt.title('RMSE Comparison Across Periods')
-        plt.ylabel('RMSE')
-        plt.grid(True, axis='y')
-        
-        plt.subplot(2, 2, 2)
-        metrics_df['Correlation'].plot(kind='bar')
-        plt.title('Forecast Correlation Comparison Across Periods')
-        plt.ylabel('Correlation')
-        plt.grid(True, axis='y')
-        
-        plt.subplot(2, 2, 3)
-        metrics_df['MAE'].plot(kind='bar')
-        plt.title('MAE Comparison Across Periods')
-        plt.ylabel('MAE')
-        plt.grid(True, axis='y')
-        
-        plt.subplot(2, 2, 4)
-        for period in available_periods:
-            realized = results[period]['realized_vol']
-            predicted = results[period]['cond_vol']
-            
-            joined = pd.concat([realized, predicted], axis=1).dropna()
-            if not joined.empty:
-                plt.scatter(
-                    joined.iloc[:, 0], 
-                    joined.iloc[:, 1], 
-                    label=period,
-                    alpha=0.7
-                )
-        
-        plt.plot([0, 100], [0, 100], 'k--', alpha=0.5)  
-        plt.title('Realized vs. Predicted Volatility')
-        plt.xlabel('Realized Volatility')
-        plt.ylabel('Predicted Volatility')
-        plt.legend()
-        plt.grid(True)
-        
-        plt.tight_layout()
-        plt.savefig('GARCH_Period_Comparison.png')
-        plt.show()
-        
-        return metrics_df
-
-    comparison_results = compare_periods()
-
-    print("\nChecking for asymmetric effects by fitting GJR-GARCH model...")
-    for period_name in results.keys():
-        returns = results[period_name]['returns'].dropna()
-        
+def main():
+    # Fit every period in parallel through the study runner, then analyze each from the fit cache
+    from GARCH_study_runner import ModelSpec, fit_cached, run_study
+    run_study(periods, [ModelSpec('GARCH', p=1, q=1), ModelSpec('GARCH', p=1, o=1, q=1)])
+
+    results = {}
+    for period_name, (start_date, end_date) in periods.items():
         try:
-            gjr_model = arch_model(returns, vol='GARCH', p=1, q=1, o=1)
-            gjr_fit = gjr_model.fit(disp='off')
-            
-            params = gjr_fit.params
-            
-            gamma_param = None
-            for param_name in params.index:
-                if 'gamma' in param_name:
-                    gamma_param = param_name
-                    break
-            
-            if gamma_param:
-                asymmetry_coef = params[gamma_param]
-                print(f"\n{period_name} Period:")
-                print(f"Asymmetry coefficient: {asymmetry_coef:.4f}")
-                print(f"Significant at 5%: {'Yes' if gjr_fit.pvalues[gamma_param] < 0.05 else 'No'}")
-                print(f"p-value: {gjr_fit.pvalues[gamma_param]:.4f}")
-            else:
-                print(f"\n{period_name} Period: No asymmetry coefficient found in GJR-GARCH model")
+            results[period_name] = analyze_period(period_name, start_date, end_date)
         except Exception as e:
-            print(f"Error fitting GJR-GARCH for {period_name}: {e}")
+            print(f"Error analyzing {period_name} period: {e}")
 
-    crisis_periods = ['GFC', 'COVID']
-    calm_periods = ['Calm_Post_GFC', 'Calm_Recent']
-    
-    available_crisis = [p for p in crisis_periods if p in results]
-    available_calm = [p for p in calm_periods if p in results]
-    
-    if available_crisis and available_calm:
-        print("\n" + "="*60)
-        print("FINAL SUMMARY: GARCH FORECAST VS REALIZED VOLATILITY")
-        print("="*60)
-        print("\nKey Findings:")
-        print("1. Crisis vs Calm Period Performance:")
-        
-        crisis_rmse = sum(results[p]['eval_results']['RMSE'] for p in available_crisis) / len(available_crisis)
-        calm_rmse = sum(results[p]['eval_results']['RMSE'] for p in available_calm) / len(available_calm)
-        print(f"   - Average RMSE in Crisis Periods: {crisis_rmse:.4f}")
-        print(f"   - Average RMSE in Calm Periods: {calm_rmse:.4f}")
-        print(f"   - Ratio (Crisis/Calm): {crisis_rmse / calm_rmse:.2f}x")
-
-        # Correlation 
-        crisis_corr = sum(results[p]['eval_results']['Correlation'] for p in available_crisis) / len(available_crisis)
-        calm_corr = sum(results[p]['eval_results']['Correlation'] for p in available_calm) / len(available_calm)
-        print(f"\n2. Forecast Correlation with Realized Volatility:")
-        print(f"   - Average Correlation in Crisis Periods: {crisis_corr:.4f}")
-        print(f"   - Average Correlation in Calm Periods: {calm_corr:.4f}")
-
-        print("\n3. Model Parameter Stability:")
-        for period in results.keys():
-            alpha = results[period]['model'].params['alpha[1]']
-            beta = results[period]['model'].params['beta[1]']
-            persistence = alpha + beta
-            print(f"   - {period}: α={alpha:.4f}, β={beta:.4f}, Persistence={persistence:.4f}")
-
-        print("\n4. Conclusion:")
-        print("   Based on the analysis, GARCH models show:")
-        if crisis_rmse > calm_rmse:
-            print(f"   - Higher prediction errors during crisis periods ({crisis_rmse/calm_rmse:.2f}x higher RMSE)")
-        else:
-            print(f"   - Surprisingly lower prediction errors during crisis periods")
-            
-        if crisis_corr > calm_corr:
-            print(f"   - Stronger correlation with realized volatility during crisis periods")
-        else:
-            print(f"   - Weaker correlation with realized volatility during crisis periods")
-else:
-    print("No periods could be successfully analyzed. Please check the data and error messages above.")
+    # Run comparative analysis if results for at least one period
+    if results:
+        def compare_periods():
+            # Get only the periods that were successfully analyzed
+            available_periods = list(results.keys())
+
+            if len(available_periods) < 2:
+                print("\nNot enough periods successfully analyzed for comparison")
+                return None
+
+            metrics_df = pd.DataFrame({
+                period: results[period]['eval_results'] 
+                for period in available_periods
+            }).T
+
+            print("\nComparative Analysis Across Periods:")
+            print(metrics_df)
+
+            plt.figure(figsize=(14, 12))
+
+            plt.subplot(2, 2, 1)
+            metrics_df['RMSE'].plot(kind='bar')
+            plt.title('RMSE Comparison Across Periods')
+            plt.ylabel('RMSE')
+            plt.grid(True, axis='y')
+
+            plt.subplot(2, 2, 2)
+            metrics_df['Correlation'].plot(kind='bar')
+            plt.title('Forecast Correlation Comparison Across Periods')
+            plt.ylabel('Correlation')
+            plt.grid(True, axis='y')
+
+            plt.subplot(2, 2, 3)
+            metrics_df['MAE'].plot(kind='bar')
+            plt.title('MAE Comparison Across Periods')
+            plt.ylabel('MAE')
+            plt.grid(True, axis='y')
+
+            plt.subplot(2, 2, 4)
+            for period in available_periods:
+                realized = results[period]['realized_vol']
+                predicted = results[period]['cond_vol']
+
+                joined = pd.concat([realized, predicted], axis=1).dropna()
+                if not joined.empty:
+                    plt.scatter(
+                        joined.iloc[:, 0], 
+                        joined.iloc[:, 1], 
+                        label=period,
+                        alpha=0.7
+                    )
+
+            plt.plot([0, 100], [0, 100], 'k--', alpha=0.5)  
+            plt.title('Realized vs. Predicted Volatility')
+            plt.xlabel('Realized Volatility')
+            plt.ylabel('Predicted Volatility')
+            plt.legend()
+            plt.grid(True)
+
+            plt.tight_layout()
+            plt.savefig('GARCH_Period_Comparison.png')
+            plt.show()
+
+            return metrics_df
+
+        comparison_results = compare_periods()
+
+        print("\nChecking for asymmetric effects by fitting GJR-GARCH model...")
+        for period_name in results.keys():
+            returns = results[period_name]['returns'].dropna()
+
+            try:
+                # Served from the GARCH_study_runner cache when the study already fitted this period
+                gjr_fit, _ = fit_cached(returns, ModelSpec('GARCH', p=1, o=1, q=1))
+
+                params = gjr_fit['params']
+
+                gamma_param = None
+                for param_name in params.index:
+                    if 'gamma' in param_name:
+                        gamma_param = param_name
+                        break
+
+                if gamma_param:
+                    asymmetry_coef = params[gamma_param]
+                    print(f"\n{period_name} Period:")
+                    print(f"Asymmetry coefficient: {asymmetry_coef:.4f}")
+                    print(f"Significant at 5%: {'Yes' if gjr_fit['pvalues'][gamma_param] < 0.05 else 'No'}")
+                    print(f"p-value: {gjr_fit['pvalues'][gamma_param]:.4f}")
+                else:
+                    print(f"\n{period_name} Period: No asymmetry coefficient found in GJR-GARCH model")
+            except Exception as e:
+                print(f"Error fitting GJR-GARCH for {period_name}: {e}")
+
+        crisis_periods = ['GFC', 'COVID']
+        calm_periods = ['Calm_Post_GFC', 'Calm_Recent']
+
+        available_crisis = [p for p in crisis_periods if p in results]
+        available_calm = [p for p in calm_periods if p in results]
+
+        if available_crisis and available_calm:
+            print("\n" + "="*60)
+            print("FINAL SUMMARY: GARCH FORECAST VS REALIZED VOLATILITY")
+            print("="*60)
+            print("\nKey Findings:")
+            print("1. Crisis vs Calm Period Performance:")
+
+            crisis_rmse = sum(results[p]['eval_results']['RMSE'] for p in available_crisis) / len(available_crisis)
+            calm_rmse = sum(results[p]['eval_results']['RMSE'] for p in available_calm) / len(available_calm)
+            print(f"   - Average RMSE in Crisis Periods: {crisis_rmse:.4f}")
+            print(f"   - Average RMSE in Calm Periods: {calm_rmse:.4f}")
+            print(f"   - Ratio (Crisis/Calm): {crisis_rmse / calm_rmse:.2f}x")
+
+            # Correlation 
+            crisis_corr = sum(results[p]['eval_results']['Correlation'] for p in available_crisis) / len(available_crisis)
+            calm_corr = sum(results[p]['eval_results']['Correlation'] for p in available_calm) / len(available_calm)
+            print(f"\n2. Forecast Correlation with Realized Volatility:")
+            print(f"   - Average Correlation in Crisis Periods: {crisis_corr:.4f}")
+            print(f"   - Average Correlation in Calm Periods: {calm_corr:.4f}")
+
+            print("\n3. Model Parameter Stability:")
+            for period in results.keys():
+                alpha = results[period]['model']['params']['alpha[1]']
+                beta = results[period]['model']['params']['beta[1]']
+                persistence = alpha + beta
+                print(f"   - {period}: α={alpha:.4f}, β={beta:.4f}, Persistence={persistence:.4f}")
+
+            print("\n4. Conclusion:")
+            print("   Based on the analysis, GARCH models show:")
+            if crisis_rmse > calm_rmse:
+                print(f"   - Higher prediction errors during crisis periods ({crisis_rmse/calm_rmse:.2f}x higher RMSE)")
+            else:
+                print(f"   - Surprisingly lower prediction errors during crisis periods")
+
+            if crisis_corr > calm_corr:
+                print(f"   - Stronger correlation with realized volatility during crisis periods")
+            else:
+                print(f"   - Weaker correlation with realized volatility during crisis periods")
+    else:
+        print("No periods could be successfully analyzed. Please check the data and error messages above.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import os
+import sys
+import pickle
+import hashlib
+import time
+import numpy as np
+import pandas as pd
+from arch import arch_model
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'MARKET DATA'))
+from market_data import load_history
+from Rolling_statistics_engine import price_column
+from Forecasting_GARCH import periods as PERIODS, calc_realized_volatility, evaluate_forecasts
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'garch_cache')
+DEFAULT_OUTPUT_CSV = os.path.join(DEFAULT_CACHE_DIR, 'GARCH_study_results.csv')
+CACHE_VERSION = 2  # bumped whenever the cached summary gains fields
+
+
+class ModelSpec(NamedTuple):
+    vol: str = 'GARCH'
+    p: int = 1
+    o: int = 0
+    q: int = 1
+    dist: str = 'normal'
+
+    @property
+    def label(self) -> str:
+        name = 'GJR-GARCH' if self.vol == 'GARCH' and self.o > 0 else self.vol
+        orders = f"{self.p},{self.o},{self.q}" if self.o > 0 else f"{self.p},{self.q}"
+        return f"{name}({orders})"
+
+
+DEFAULT_SPECS = [
+    ModelSpec('GARCH', 1, 0, 1),
+    ModelSpec('GARCH', 1, 1, 1),
+    ModelSpec('EGARCH', 1, 1, 1),
+    ModelSpec('GARCH', 2, 0, 1),
+    ModelSpec('GARCH', 1, 0, 2),
+]
+
+
+def series_hash(returns: pd.Series) -> str:
+    """Content hash of a return series (dates and values)"""
+    h = hashlib.sha1()
+    h.update(returns.index.values.astype('datetime64[ns]').view(np.int64).tobytes())
+    h.update(returns.to_numpy(dtype=float).tobytes())
+    return h.hexdigest()
+
+
+def fit_cached(returns: pd.Series, spec: ModelSpec, cache_dir: str = DEFAULT_CACHE_DIR):
+    """Fit `spec` to `returns` with arch, reusing a previous fit of the same series and spec.
+
+    Fits are stored as small pickled dicts keyed by (series hash, model spec).
+    Returns the fit summary and whether it came from the cache.
+    """
+    key = hashlib.sha1(f"{series_hash(returns)}|{tuple(spec)}|{CACHE_VERSION}".encode()).hexdigest()
+    path = os.path.join(cache_dir, f"{key}.pkl")
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return pickle.load(f), True
+
+    fit = arch_model(returns, vol=spec.vol, p=spec.p, o=spec.o, q=spec.q,
+                     dist=spec.dist, rescale=False).fit(disp='off')
+    summary = {
+        'params': fit.params,
+        'std_err': fit.std_err,
+        'tvalues': fit.tvalues,
+        'pvalues': fit.pvalues,
+        'loglikelihood': fit.loglikelihood,
+        'aic': fit.aic,
+        'bic': fit.bic,
+        'conditional_volatility': fit.conditional_volatility,
+        'forecast_variance': fit.forecast(horizon=1).variance.iloc[-1, 0]
+    }
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        pickle.dump(summary, f)
+    os.replace(tmp, path)
+    return summary, False
+
+
+def run_task(period_name: str, returns: pd.Series, spec: ModelSpec, cache_dir: str) -> Dict:
+    """One (period, model) cell of the study; runs in a worker process"""
+    start = time.perf_counter()
+    fit, cached = fit_cached(returns, spec, cache_dir)
+    row = {'period': period_name, 'model': spec.label, 'cached': cached}
+    # Annualised conditional volatility against 21-day realized volatility, as in Forecasting_GARCH.py
+    row.update(evaluate_forecasts(calc_realized_volatility(returns), fit['conditional_volatility'] * np.sqrt(252)))
+    row.update({'loglikelihood': fit['loglikelihood'], 'aic': fit['aic'], 'bic': fit['bic']})
+    for name, value in fit['params'].items():
+        row[name] = value
+    gamma = [name for name in fit['pvalues'].index if name.startswith('gamma')]
+    if gamma:
+        row['gamma_pvalue'] = fit['pvalues'][gamma[0]]
+    row['seconds'] = time.perf_counter() - start
+    return row
+
+
+def run_study(periods: Dict[str, tuple] = PERIODS, specs: List[ModelSpec] = DEFAULT_SPECS,
+              max_workers: Optional[int] = None, cache_dir: str = DEFAULT_CACHE_DIR,
+              output_csv: Optional[str] = DEFAULT_OUTPUT_CSV) -> pd.DataFrame:
+    """Fit every model spec on every period in a process pool and tabulate the results (also saved to output_csv)"""
+    returns = {}
+    for period_name, (start_date, end_date) in periods.items():
+        data = load_history('^GSPC', start=start_date, end=end_date)
+        returns[period_name] = (100 * data[price_column(data)].pct_change()).dropna()
+
+    tasks = [(name, returns[name], spec, cache_dir) for name in periods for spec in specs]
+    rows = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(run_task, *task) for task in tasks]
+        for (name, _, spec, _), future in zip(tasks, futures):
+            try:
+                rows.append(future.result())
+            except Exception as e:
+                print(f"Error fitting {spec.label} for {name}: {e}")
+
+    results = pd.DataFrame(rows).set_index(['period', 'model'])
+    if output_csv:
+        os.makedirs(os.path.dirname(os.path.abspath(output_csv)), exist_ok=True)
+        results.to_csv(output_csv)
+    return results
+
+
+def main():
+    # Example usage: the second run is served entirely from the fit cache
+    for attempt in (1, 2):
+        start = time.perf_counter()
+        results = run_study()
+        elapsed = time.perf_counter() - start
+        print(f"Run {attempt}: {len(results)} fits in {elapsed:.1f}s ({int(results['cached'].sum())} from cache)")
+
+    pd.set_option('display.width', 200)
+    print(results[['RMSE', 'MAE', 'Correlation', 'loglikelihood', 'bic']].round(4))
+    print("\nBest model per period (BIC):")
+    print(results['bic'].groupby(level='period').idxmin().apply(lambda idx: idx[1]))
+
+
+if __name__ == "__main__":
+    main()
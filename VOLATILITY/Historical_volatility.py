@@ -1,70 +1,49 @@
 import numpy as np
 import pandas as pd
-import yfinance as yf
 import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
-import time
+import os
+import sys
 
-def fetch_data(tickers, period="1y"):
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'MARKET DATA'))
+from market_data import MarketDataStore
+from bulk_loader import BulkLoader
+from Rolling_statistics_engine import align_prices, rolling_volatility, rolling_sharpe_ratio
+from Range_volatility_estimators import align_ohlc, range_volatility
+
+def fetch_data(tickers, period="1y", store=None):
+    # Concurrent, rate-limited batch downloads replace the sequential 10s sleeps
+    if store is None:
+        loader = BulkLoader(batch_size=20, max_workers=4, rate=1.0)
+        store = MarketDataStore(source=loader)
     data = {}
-    for ticker in tickers:
-        try:
-            stock_data = yf.download(ticker, period=period)
-            data[ticker] = stock_data
-            time.sleep(10)  # To avoid hitting the API limit
-        except Exception as e:
-            print(f"Error fetching data for {ticker}: {e}")
+    try:
+        data = store.history_many(tickers, period=period)
+    except Exception as e:
+        print(f"Error fetching data: {e}")
+    if isinstance(store.source, BulkLoader):
+        for ticker, error in store.source.errors.items():
+            print(f"Error fetching data for {ticker}: {error}")
     return data
 
 def calculate_volatility(data, window=21):
-    volatility = {}
-    for ticker, df in data.items():
-        if not df.empty:
-            # Check which column to use for price data
-            if 'Adj Close' in df.columns:
-                price_col = 'Adj Close'
-            elif 'Close' in df.columns:
-                price_col = 'Close'
-            else:
-                print(f"Warning: No price data found for {ticker}. Available columns: {df.columns}")
-                continue
-            
-            df['Returns'] = np.log(df[price_col] / df[price_col].shift(1))
-            
-            df['Volatility'] = df['Returns'].rolling(window=window).std() * np.sqrt(252)
-            
-            volatility[ticker] = df['Volatility']
-    
-    return volatility
+    # All tickers are aligned into one (dates x tickers) array and rolled in a single pass
+    prices = align_prices(data)
+    for ticker in data:
+        if ticker not in prices.columns and not data[ticker].empty:
+            print(f"Warning: No price data found for {ticker}. Available columns: {data[ticker].columns}")
+    vol = rolling_volatility(prices, window=window)
+    return {ticker: vol[ticker] for ticker in vol.columns}
 
 def calculate_sharpe_ratio(data, risk_free_rate=0.02, window=252):
-    sharpe_ratios = {}
-    for ticker, df in data.items():
-        if not df.empty:
-            if 'Returns' not in df.columns:
-                if 'Adj Close' in df.columns:
-                    price_col = 'Adj Close'
-                elif 'Close' in df.columns:
-                    price_col = 'Close'
-                else:
-                    print(f"Warning: No price data found for {ticker}. Available columns: {df.columns}")
-                    continue
-                
-                df['Returns'] = np.log(df[price_col] / df[price_col].shift(1))
-            
-            df['Mean_Return'] = df['Returns'].rolling(window=window).mean() * 252
-            
-            df['Rolling_Vol'] = df['Returns'].rolling(window=window).std() * np.sqrt(252)
-            
-            df['Sharpe_Ratio'] = np.where(
-                df['Rolling_Vol'] > 0,
-                (df['Mean_Return'] - risk_free_rate) / df['Rolling_Vol'],
-                np.nan
-            )
-            
-            sharpe_ratios[ticker] = df['Sharpe_Ratio']
-    
-    return sharpe_ratios
+    prices = align_prices(data)
+    sharpe = rolling_sharpe_ratio(prices, risk_free_rate=risk_free_rate, window=window)
+    return {ticker: sharpe[ticker] for ticker in sharpe.columns}
+
+def calculate_range_volatility(data, window=10, estimator='yang_zhang'):
+    # OHLC estimators are several times more efficient than close-to-close, so shorter windows suffice
+    vol = range_volatility(align_ohlc(data), estimator=estimator, window=window)
+    return {ticker: vol[ticker] for ticker in vol.columns}
 
 def plot_volatility(volatilities, tickers):
     """Create a figure window with two volatility plots (one below the other)"""
@@ -155,6 +134,10 @@ def main():
     debug_data_structure(stock_data)
     volatilities = calculate_volatility(stock_data, window=21)
     sharpe_ratios = calculate_sharpe_ratio(stock_data, risk_free_rate=0.02, window=252)
+    range_volatilities = calculate_range_volatility(stock_data, window=10)
+    print("\nLatest volatility: 21-day close-to-close vs 10-day Yang-Zhang")
+    for ticker in range_volatilities:
+        print(f"{ticker}: {volatilities[ticker].iloc[-1]:.2%} vs {range_volatilities[ticker].iloc[-1]:.2%}")
     vol_fig = plot_volatility(volatilities, tickers)
     sharpe_fig = plot_sharpe_ratio(sharpe_ratios, tickers)
     
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+from Rolling_statistics_engine import TRADING_DAYS, rolling_mean_std
+
+OHLC = ('Open', 'High', 'Low', 'Close')
+ESTIMATORS = ('close_to_close', 'parkinson', 'garman_klass', 'rogers_satchell', 'yang_zhang')
+
+
+def _adjustment(df: pd.DataFrame) -> pd.Series:
+    """Split/dividend factor Adj Close / Close (1 where no adjusted close is available)"""
+    if 'Adj Close' not in df.columns:
+        return pd.Series(1.0, index=df.index)
+    return (df['Adj Close'].astype(float) / df['Close'].astype(float)).fillna(1.0)
+
+
+def align_ohlc(data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """One (dates x tickers) frame per OHLC field, aligned on the union of dates.
+
+    Bars are scaled by Adj Close / Close when an adjusted close is present, so
+    ex-dividend dates and splits do not show up as overnight gaps and
+    close_to_close matches the volatility of Rolling_statistics_engine.align_prices.
+    """
+    frames = {ticker: df for ticker, df in data.items() if not df.empty and all(f in df.columns for f in OHLC)}
+    factors = {ticker: _adjustment(df) for ticker, df in frames.items()}
+    return {field: pd.DataFrame({ticker: df[field].astype(float) * factors[ticker]
+                                 for ticker, df in frames.items()}).sort_index()
+            for field in OHLC}
+
+
+# ------ Daily variance components (arrays of shape dates x tickers) ------
+def parkinson_variance(high, low):
+    """Parkinson (1980): high-low range, assumes no drift and no opening jump"""
+    return np.log(high / low) ** 2 / (4 * np.log(2))
+
+
+def garman_klass_variance(open_, high, low, close):
+    """Garman-Klass (1980): range plus open-to-close move, assumes no drift"""
+    hl = np.log(high / low)
+    co = np.log(close / open_)
+    return 0.5 * hl ** 2 - (2 * np.log(2) - 1) * co ** 2
+
+
+def rogers_satchell_variance(open_, high, low, close):
+    """Rogers-Satchell (1991): unbiased under non-zero drift"""
+    return (np.log(high / close) * np.log(high / open_)
+            + np.log(low / close) * np.log(low / open_))
+
+
+def _previous_close(close):
+    prev = np.full_like(close, np.nan)
+    prev[1:] = close[:-1]
+    return prev
+
+
+def _window_stats(x, window, min_periods):
+    """(mean, sample variance, non-NaN count) over rolling windows, or over the full sample when window is None"""
+    if window is None:
+        n = np.sum(~np.isnan(x), axis=0, keepdims=True).astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.nanmean(x, axis=0, keepdims=True), np.nanvar(x, axis=0, ddof=1, keepdims=True), n
+    mean, std = rolling_mean_std(x, window, min_periods)
+    counts = np.cumsum(~np.isnan(x), axis=0, dtype=float)
+    n = counts.copy()
+    n[window:] -= counts[:-window]
+    return mean, std ** 2, n
+
+
+def range_variance(open_, high, low, close, estimator: str = 'yang_zhang',
+                   window: Optional[int] = None, min_periods: Optional[int] = None) -> np.ndarray:
+    """Daily variance from OHLC arrays of shape (dates x tickers).
+
+    With window=None one estimate per ticker over the whole sample (shape 1 x
+    tickers); otherwise a rolling estimate per date.
+    """
+    open_, high, low, close = (np.asarray(a, dtype=float) for a in (open_, high, low, close))
+    if estimator == 'close_to_close':
+        _, var, _ = _window_stats(np.log(close / _previous_close(close)), window, min_periods)
+        return var
+    if estimator == 'parkinson':
+        return _window_stats(parkinson_variance(high, low), window, min_periods)[0]
+    if estimator == 'garman_klass':
+        return _window_stats(garman_klass_variance(open_, high, low, close), window, min_periods)[0]
+    if estimator == 'rogers_satchell':
+        return _window_stats(rogers_satchell_variance(open_, high, low, close), window, min_periods)[0]
+    if estimator == 'yang_zhang':
+        # Yang-Zhang (2000): overnight variance + k * open-to-close variance + (1 - k) * Rogers-Satchell
+        _, overnight, n = _window_stats(np.log(open_ / _previous_close(close)), window, min_periods)
+        _, open_close, _ = _window_stats(np.log(close / open_), window, min_periods)
+        rs = _window_stats(rogers_satchell_variance(open_, high, low, close), window, min_periods)[0]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            k = 0.34 / (1.34 + (n + 1) / (n - 1))
+        return overnight + k * open_close + (1 - k) * rs
+    raise ValueError(f"Unknown estimator: {estimator}. Choose from {ESTIMATORS}")
+
+
+def range_volatility(ohlc: Dict[str, pd.DataFrame], estimator: str = 'yang_zhang',
+                     window: Optional[int] = 10, min_periods: Optional[int] = None) -> pd.DataFrame:
+    """Annualised volatility from aligned OHLC frames (see align_ohlc)"""
+    close = ohlc['Close']
+    var = range_variance(ohlc['Open'].to_numpy(), ohlc['High'].to_numpy(), ohlc['Low'].to_numpy(),
+                         close.to_numpy(), estimator, window, min_periods)
+    vol = np.sqrt(np.maximum(var, 0) * TRADING_DAYS)
+    index = close.index if window is not None else ['full_sample']
+    return pd.DataFrame(vol, index=index, columns=close.columns)
+
+
+def simulate_ohlc(n_days: int, n_tickers: int, sigma: float = 0.2, overnight_share: float = 0.2,
+                  steps_per_day: int = 390, seed: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """Driftless GBM bars with an overnight gap, sampled on an intraday grid"""
+    rng = np.random.default_rng(seed)
+    daily_var = sigma ** 2 / TRADING_DAYS
+    open_ = np.empty((n_days, n_tickers))
+    high = np.empty_like(open_)
+    low = np.empty_like(open_)
+    close = np.empty_like(open_)
+    last = np.zeros(n_tickers)
+    for d in range(n_days):
+        gap = rng.normal(0, np.sqrt(overnight_share * daily_var), n_tickers)
+        steps = rng.normal(0, np.sqrt((1 - overnight_share) * daily_var / steps_per_day), (steps_per_day, n_tickers))
+        path = last + gap + np.vstack([np.zeros(n_tickers), np.cumsum(steps, axis=0)])
+        open_[d], high[d], low[d], close[d] = path[0], path.max(axis=0), path.min(axis=0), path[-1]
+        last = path[-1]
+    dates = pd.bdate_range('2020-01-01', periods=n_days)
+    columns = [f"T{i}" for i in range(n_tickers)]
+    return {field: pd.DataFrame(100 * np.exp(a), index=dates, columns=columns)
+            for field, a in zip(OHLC, (open_, high, low, close))}
+
+
+def main():
+    # Example usage: dispersion of 10-day estimates relative to close-to-close.
+    # Only close-to-close and Yang-Zhang see the overnight gap, hence the lower level of the others.
+    ohlc = simulate_ohlc(n_days=2000, n_tickers=50, sigma=0.2, seed=0)
+    window = 10
+    print(f"{window}-day windows, true volatility 20% (20% of the variance overnight)")
+    print(f"{'Estimator':<18}{'Mean vol':>10}{'Rel. variance':>15}{'Efficiency':>12}")
+    baseline = None
+    for estimator in ESTIMATORS:
+        var = range_variance(*(ohlc[f].to_numpy() for f in OHLC), estimator=estimator, window=window)
+        var = var[window:] * TRADING_DAYS
+        rel_variance = np.nanvar(var) / np.nanmean(var) ** 2
+        baseline = rel_variance if baseline is None else baseline
+        print(f"{estimator:<18}{np.sqrt(np.nanmean(var)):>10.2%}{rel_variance:>15.4f}{baseline / rel_variance:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from scipy.optimize import minimize
+from typing import Optional
+
+from Batch_GARCH import GARCH_PARAMS, GJR_PARAMS, garch_backcast, garch_loglik_series, parameter_space
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'MARKET DATA'))
+from market_data import load_history
+
+
+def fit_garch_series(returns: np.ndarray, gjr: bool = False, start: Optional[np.ndarray] = None):
+    """Maximum likelihood GARCH(1,1) / GJR-GARCH(1,1,1) fit of one series.
+
+    `start` (model parameters, e.g. yesterday's estimates) warm-starts the
+    optimiser; without it a small grid of starting values is searched as in
+    `arch`. Returns the parameters, the conditional variances, and the number
+    of likelihood evaluations used.
+    """
+    M, lower, upper, persistence_weights = parameter_space(gjr)
+    n_obs = len(returns)
+    mean, var = returns.mean(), returns.var()
+    backcast = float(garch_backcast(returns - mean))
+    scale = np.ones(len(lower))
+    scale[0], scale[1] = np.sqrt(var), var
+    evaluations = 0
+
+    def objective(x):
+        nonlocal evaluations
+        evaluations += 1
+        loglik, grad, _ = garch_loglik_series((M @ x) * scale, returns, backcast, gjr)
+        excess = max(persistence_weights @ x - (1.0 - 1e-6), 0.0)
+        f = -loglik / n_obs + 1e4 * excess ** 2
+        g = -(grad * scale) @ M / n_obs + 2e4 * excess * persistence_weights
+        return f, g
+
+    if start is not None:
+        x0 = np.clip(np.linalg.solve(M, start / scale), lower, upper)
+    else:
+        best = np.inf
+        for alpha in (0.01, 0.05, 0.1, 0.2):
+            for persistence in (0.5, 0.7, 0.9, 0.98):
+                beta = persistence - alpha - (0.5 * alpha if gjr else 0.0)
+                if beta < 0:
+                    continue
+                candidate = np.array([mean / scale[0], 1.0 - persistence, alpha]
+                                     + ([2 * alpha] if gjr else []) + [beta])
+                f, _ = objective(candidate)
+                if f < best:
+                    x0, best = candidate, f
+
+    result = minimize(objective, x0, jac=True, method='L-BFGS-B', bounds=list(zip(lower, upper)),
+                      options={'ftol': 1e-12, 'gtol': 1e-6})
+    params = (M @ result.x) * scale
+    _, _, sigma2 = garch_loglik_series(params, returns, backcast, gjr)
+    return params, sigma2, evaluations
+
+
+def walk_forward_garch(returns: pd.Series, initial_window: int = 500, window: Optional[int] = None,
+                       refit_every: int = 1, gjr: bool = False, warm_start: bool = True):
+    """Genuine out-of-sample one-step-ahead GARCH volatility forecasts.
+
+    For every date t after the first `initial_window` observations, the
+    forecast of the variance of r_t only uses returns up to t-1. The model is
+    re-estimated every `refit_every` days on an expanding window (window=None)
+    or a rolling window of `window` observations, each optimisation seeded
+    from the previous estimates when warm_start is set. Between refits the
+    variance recursion is rolled forward one observation at a time,
+        sigma2_t = omega + (alpha + gamma * 1[e_{t-1} < 0]) * e_{t-1}^2 + beta * sigma2_{t-1},
+    instead of being recomputed from the first observation.
+    """
+    returns = returns.dropna()
+    r = returns.to_numpy(dtype=float)
+    names = GJR_PARAMS if gjr else GARCH_PARAMS
+    forecasts = np.full(len(r), np.nan)
+    history = np.full((len(r), len(names)), np.nan)
+    params, sigma2_prev = None, None
+    fits = evaluations = 0
+
+    start_time = time.perf_counter()
+    for t in range(initial_window, len(r)):
+        if (t - initial_window) % refit_every == 0:
+            lo = 0 if window is None else max(0, t - window)
+            params, sigma2, n_eval = fit_garch_series(r[lo:t], gjr, params if warm_start else None)
+            fits += 1
+            evaluations += n_eval
+            sigma2_prev = sigma2[-1]
+        mu, omega, alpha = params[:3]
+        gamma = params[3] if gjr else 0.0
+        beta = params[-1]
+        e = r[t - 1] - mu
+        sigma2_prev = omega + (alpha + gamma * (e < 0)) * e ** 2 + beta * sigma2_prev
+        forecasts[t] = sigma2_prev
+        history[t] = params
+    elapsed = time.perf_counter() - start_time
+
+    result = pd.DataFrame(history, index=returns.index, columns=names)
+    result.insert(0, 'return', r)
+    result.insert(1, 'forecast_var', forecasts)
+    result.insert(2, 'forecast_vol', np.sqrt(forecasts) * np.sqrt(252))
+    result = result.iloc[initial_window:]
+    stats = {'fits': fits, 'evaluations': evaluations, 'seconds': elapsed}
+    return result, stats
+
+
+def forecast_losses(result: pd.DataFrame) -> dict:
+    """Out-of-sample losses of the variance forecasts against squared (demeaned) returns"""
+    proxy = (result['return'] - result['return'].mean()) ** 2
+    h = result['forecast_var']
+    return {
+        'MSE': np.mean((proxy - h) ** 2),
+        'QLIKE': np.mean(np.log(h) + proxy / h),
+        'Correlation': np.corrcoef(proxy, h)[0, 1]
+    }
+
+
+def main():
+    # Example usage: daily walk-forward forecasts of S&P 500 volatility, warm vs cold refits
+    data = load_history('^GSPC', start='2016-01-01', end='2023-12-31')
+    returns = 100 * data['Adj Close'].pct_change().dropna()
+
+    warm, warm_stats = walk_forward_garch(returns, initial_window=750, warm_start=True)
+    cold, cold_stats = walk_forward_garch(returns, initial_window=750, warm_start=False)
+    print(f"Warm starts: {warm_stats['fits']} fits, {warm_stats['evaluations']} likelihood evaluations, "
+          f"{warm_stats['seconds']:.1f}s")
+    print(f"Cold starts: {cold_stats['fits']} fits, {cold_stats['evaluations']} likelihood evaluations, "
+          f"{cold_stats['seconds']:.1f}s")
+    print(f"Max forecast difference (annualised vol): {np.max(np.abs(warm['forecast_vol'] - cold['forecast_vol'])):.4f}")
+    print("\nOut-of-sample forecast losses:")
+    for metric, value in forecast_losses(warm).items():
+        print(f"{metric}: {value:.4f}")
+
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 9), sharex=True)
+    ax1.plot(warm.index, np.abs(warm['return']) * np.sqrt(252), color='lightgray', label='|Return| (annualised)')
+    ax1.plot(warm.index, warm['forecast_vol'], color='blue', label='One-step-ahead GARCH forecast')
+    ax1.set_ylabel('Annualized Volatility (%)')
+    ax1.set_title('Walk-Forward GARCH(1,1) Volatility Forecasts (S&P 500)')
+    ax1.legend()
+    ax1.grid(True)
+    ax2.plot(warm.index, warm['alpha[1]'], label='alpha')
+    ax2.plot(warm.index, warm['beta[1]'], label='beta')
+    ax2.set_title('Daily Re-estimated Parameters')
+    ax2.legend()
+    ax2.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()